@@ -21,28 +21,42 @@ then
     echo $LF 1>&2
     if python structure_test.py
     then
-        cd ya_news
-        export DJANGO_SETTINGS_MODULE="${DJANGO_SETTINGS_MODULE:="yanews.settings"}"
-        if pytest --tb=line 1>&2;
+        # Проекты тестируются одновременно, каждый на половине ядер;
+        # у каждого процесса pytest-xdist своя база SQLite в памяти.
+        # Число процессов на проект можно задать в PYTEST_WORKERS.
+        workers="${PYTEST_WORKERS:-$(python -c 'import os; print(max(os.cpu_count() // 2, 1))')}"
+        news_log=$(mktemp)
+        note_log=$(mktemp)
+        trap 'rm -f "$news_log" "$note_log"' EXIT
+        (
+            cd ya_news
+            export DJANGO_SETTINGS_MODULE="${DJANGO_SETTINGS_MODULE:="yanews.test_settings"}"
+            pytest --tb=line -n "$workers"
+        ) > "$news_log" 2>&1 &
+        news_pid=$!
+        (
+            cd ya_note
+            export DJANGO_SETTINGS_MODULE="yanote.test_settings"
+            pytest --tb=line -n "$workers"
+        ) > "$note_log" 2>&1 &
+        note_pid=$!
+        wait $news_pid
+        news_status=$?
+        wait $note_pid
+        note_status=$?
+        cat "$news_log" "$note_log" 1>&2
+        if [[ $news_status -ne 0 ]];
         then
-            cd ../ya_note
-            unset DJANGO_SETTINGS_MODULE
-            export DJANGO_SETTINGS_MODULE="${DJANGO_SETTINGS_MODULE:="yanote.settings"}"
-            if pytest --tb=line 1>&2;
-            then
-                exit 0
-            else
-                status=$?
-                print_message " При запуске упали ваши тесты для проекта YaNote. Проверьте тесты этого проекта " "=" 1
-                echo \`\`\` 1>&2
-                exit $status
-            fi
-        else
-            status=$?
             print_message " При запуске упали ваши тесты для проекта YaNews. Проверьте тесты этого проекта " "=" 1
             echo \`\`\` 1>&2
-            exit $status
+            exit $news_status
+        elif [[ $note_status -ne 0 ]];
+        then
+            print_message " При запуске упали ваши тесты для проекта YaNote. Проверьте тесты этого проекта " "=" 1
+            echo \`\`\` 1>&2
+            exit $note_status
         fi
+        exit 0
     else
         status=$?
         print_message " Убедитесь, что написанные вами тесты скопированы в указанные в ТЗ директории " "=" 1
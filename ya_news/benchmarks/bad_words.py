@@ -0,0 +1,56 @@
+"""
+Время проверки одного комментария в зависимости от размера словаря.
+
+Запуск из директории ya_news:
+    python -m benchmarks.bad_words
+"""
+import random
+import timeit
+
+from news.moderation import (
+    AhoCorasickBadWordsMatcher,
+    RegexBadWordsMatcher,
+    SubstringBadWordsMatcher,
+)
+
+ALPHABET = 'абвгдеёжзийклмнопрстуфхцчшщъыьэюя'
+DICTIONARY_SIZES = (2, 10, 100, 1000, 10000)
+MATCHERS = (
+    SubstringBadWordsMatcher,
+    RegexBadWordsMatcher,
+    AhoCorasickBadWordsMatcher,
+)
+TEXT_WORDS = 80
+REPEAT = 5
+
+
+def random_word(rng, min_length=5, max_length=12):
+    length = rng.randint(min_length, max_length)
+    return ''.join(rng.choice(ALPHABET) for _ in range(length))
+
+
+def main():
+    rng = random.Random(0)
+    # Текст без запрещённых слов: худший случай, словарь проверяется целиком.
+    text = ' '.join(random_word(rng, 2, 8) for _ in range(TEXT_WORDS))
+    print(f'Длина комментария: {len(text)} символов')
+    print('Слов в словаре'.ljust(16) + ''.join(
+        matcher.__name__.replace('BadWordsMatcher', '').ljust(16)
+        for matcher in MATCHERS
+    ))
+    for size in DICTIONARY_SIZES:
+        words = {random_word(rng) for _ in range(size)}
+        row = str(size).ljust(16)
+        for matcher_class in MATCHERS:
+            matcher = matcher_class(words)
+            assert matcher.search(text) is None
+            number = 200
+            best = min(timeit.repeat(
+                lambda: matcher.search(text), number=number, repeat=REPEAT
+            ))
+            row += f'{best / number * 1e6:.1f} мкс'.ljust(16)
+        print(row)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,68 @@
+"""Массовое создание объектов для бенчмарков через bulk_create."""
+import random
+from contextlib import contextmanager
+from itertools import accumulate, islice
+
+ALPHABET = 'абвгдежзиклмнопрстуфхцчшэюя'
+VOCABULARY_SIZE = 50_000
+BATCH_SIZE = 10_000
+
+
+class Words:
+    """Случайные тексты из словаря с частотами слов по закону Ципфа."""
+
+    def __init__(self, seed=0, size=VOCABULARY_SIZE):
+        self.rng = random.Random(seed)
+        self.vocabulary = [
+            ''.join(self.rng.choices(ALPHABET, k=self.rng.randint(3, 10)))
+            for _ in range(size)
+        ]
+        self.cum_weights = list(accumulate(
+            1 / rank for rank in range(1, size + 1)
+        ))
+
+    def __call__(self, count):
+        return ' '.join(self.rng.choices(
+            self.vocabulary, cum_weights=self.cum_weights, k=count
+        ))
+
+
+def bulk_create(model, objects, batch_size=BATCH_SIZE):
+    """Создаёт объекты пачками, не собирая их все в памяти."""
+    from django.db import reset_queries, transaction
+    objects = iter(objects)
+    while True:
+        batch = list(islice(objects, batch_size))
+        if not batch:
+            return
+        with transaction.atomic():
+            model.objects.bulk_create(batch)
+        reset_queries()
+
+
+def create_users(count, prefix='user'):
+    """Пользователи без пароля; возвращает их id по порядку."""
+    from django.contrib.auth import get_user_model
+    User = get_user_model()
+    bulk_create(User, (
+        User(username=f'{prefix}{index}') for index in range(count)
+    ))
+    return list(User.objects.filter(
+        username__startswith=prefix
+    ).order_by('pk').values_list('pk', flat=True))
+
+
+@contextmanager
+def deferred_search_index():
+    """Как load_news --defer-indexes: триггеры поиска снимаются на время."""
+    from django.db import connection
+    from news import search
+    with connection.cursor() as cursor:
+        for index in search.INDEXES:
+            for sql in index.drop_triggers_sql():
+                cursor.execute(sql)
+    try:
+        yield
+    finally:
+        with connection.cursor() as cursor:
+            search.install(cursor, rebuild=True)
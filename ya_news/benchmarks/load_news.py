@@ -0,0 +1,67 @@
+"""
+Потоковая загрузка фикстуры новостей командой load_news.
+
+Запуск из директории ya_news:
+    python -m benchmarks.load_news 100000 1000000
+"""
+import argparse
+import json
+import resource
+import time
+from datetime import date, timedelta
+from io import StringIO
+
+from .utils import scratch_database
+
+DEFAULT_SIZES = (100_000, 1_000_000)
+
+
+def write_fixture(path, size):
+    """Пишет фикстуру построчно, не собирая её в памяти."""
+    first_date = date(2000, 1, 1)
+    with open(path, 'w', encoding='utf-8') as file:
+        file.write('[\n')
+        for index in range(size):
+            obj = {
+                'model': 'news.news',
+                'fields': {
+                    'date': str(first_date + timedelta(days=index % 9000)),
+                    'title': f'Новость {index}',
+                    'text': 'Текст новости. ' * 20,
+                },
+            }
+            separator = ',\n' if index < size - 1 else '\n'
+            file.write(json.dumps(obj, ensure_ascii=False) + separator)
+        file.write(']\n')
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('sizes', nargs='*', type=int, default=DEFAULT_SIZES)
+    parser.add_argument('--defer-indexes', action='store_true')
+    args = parser.parse_args()
+    with scratch_database() as tmp:
+        from django.core.management import call_command
+        from news.models import News
+        for size in args.sizes:
+            News.objects.all().delete()
+            path = tmp / f'news_{size}.json'
+            write_fixture(path, size)
+            started = time.monotonic()
+            call_command(
+                'load_news', path, defer_indexes=args.defer_indexes,
+                stdout=StringIO(),
+            )
+            elapsed = time.monotonic() - started
+            # Пиковый RSS процесса в КиБ (Linux) за всё время работы.
+            peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+            print(
+                f'{size} новостей ({path.stat().st_size / 2**20:.0f} МБ): '
+                f'{elapsed:.1f} с, {size / elapsed:.0f} строк/с, '
+                f'пиковый RSS {peak / 2**10:.0f} МБ'
+            )
+            path.unlink()
+
+
+if __name__ == '__main__':
+    main()
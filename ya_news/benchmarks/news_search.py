@@ -0,0 +1,67 @@
+"""
+Полнотекстовый поиск по архиву новостей и комментариев.
+
+Запуск из директории ya_news:
+    python -m benchmarks.news_search 2000000
+"""
+import argparse
+import statistics
+import time
+
+from .factories import Words, deferred_search_index
+from .utils import scratch_database
+
+DEFAULT_SIZE = 2_000_000
+BATCH_SIZE = 10_000
+REPEAT = 50
+# Позиции слов в словаре (по частоте) для запросов: от самых частых
+# до редких, частота распределена по закону Ципфа.
+QUERY_RANKS = ((0,), (1, 2), (10,), (100, 500), (5000,), (20_000, 30_000))
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('size', nargs='?', type=int, default=DEFAULT_SIZE)
+    args = parser.parse_args()
+    words = Words()
+    with scratch_database():
+        from django.contrib.auth import get_user_model
+        from news import search
+        from news.models import Comment, News
+        author = get_user_model().objects.create(username='author')
+        started = time.monotonic()
+        # Без триггеров и с перестройкой индекса в конце загрузка идёт
+        # в несколько раз быстрее.
+        with deferred_search_index():
+            for start in range(0, args.size, BATCH_SIZE):
+                count = min(BATCH_SIZE, args.size - start)
+                News.objects.bulk_create(
+                    News(title=words(6), text=words(60))
+                    for _ in range(count)
+                )
+                Comment.objects.bulk_create(
+                    Comment(news_id=start + index + 1, author=author,
+                            text=words(20))
+                    for index in range(count)
+                )
+        print(f'{args.size} новостей и {args.size} комментариев '
+              f'проиндексировано за {time.monotonic() - started:.0f} с')
+        for search_function in (search.search_news, search.search_comments):
+            for ranks in QUERY_RANKS:
+                query = ' '.join(words.vocabulary[rank] for rank in ranks)
+                timings = []
+                after = None
+                for _ in range(REPEAT):
+                    started = time.perf_counter()
+                    _, after = search_function(query, after, 20)
+                    timings.append(time.perf_counter() - started)
+                print(
+                    f'{search_function.__name__}, слова №{ranks} '
+                    f'по частоте: медиана '
+                    f'{statistics.median(timings) * 1e3:.2f} мс, '
+                    f'максимум {max(timings) * 1e3:.2f} мс'
+                )
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,121 @@
+"""
+Запросы, время и память каждого адреса news.urls на больших данных.
+
+Результаты сравниваются с базовой линией url_regressions.json;
+при росте числа запросов или времени и памяти сверх порога
+бенчмарк завершается с ошибкой.
+
+Запуск из директории ya_news:
+    python -m benchmarks.url_regressions
+    python -m benchmarks.url_regressions --update  # новая базовая линия
+"""
+import random
+from collections import Counter
+from datetime import date, timedelta
+from pathlib import Path
+from urllib.parse import urlencode
+
+from .factories import Words, bulk_create, create_users, deferred_search_index
+from .utils import run_url_regressions
+
+BASELINE_PATH = Path(__file__).with_name('url_regressions.json')
+NEWS_COUNT = 100_000
+COMMENTS_COUNT = 1_000_000
+USERS_COUNT = 1000
+# Самая свежая новость обсуждается больше всех.
+HOT_NEWS_COMMENTS = 5000
+FIRST_DATE = date(2015, 1, 1)
+DAYS = 3650
+
+
+def seed(scale):
+    from django.conf import settings
+    from django.contrib.auth import get_user_model
+    from django.test import Client
+    from django.urls import reverse
+    from news.archive import month_start
+    from news.models import Comment, News, NewsMonth
+    from news.pagination import get_comments_page
+
+    rng = random.Random(0)
+    words = Words()
+    news_count = max(
+        int(NEWS_COUNT * scale), settings.NEWS_COUNT_ON_HOME_PAGE + 1
+    )
+    comments_count = int(COMMENTS_COUNT * scale)
+    user_ids = create_users(USERS_COUNT)
+    hot_comments = min(HOT_NEWS_COMMENTS, comments_count)
+    # На пустой базе id новостей идут с единицы в порядке создания.
+    comment_news_ids = [news_count] * hot_comments + [
+        rng.randint(1, news_count)
+        for _ in range(comments_count - hot_comments)
+    ]
+    comment_counts = Counter(comment_news_ids)
+    dates = [
+        FIRST_DATE + timedelta(days=index * DAYS // news_count)
+        for index in range(news_count)
+    ]
+    with deferred_search_index():
+        bulk_create(News, (
+            News(
+                title=words(6)[:50],
+                text=words(60),
+                date=news_date,
+                comment_count=comment_counts[index],
+            )
+            for index, news_date in enumerate(dates, start=1)
+        ))
+        # Первый комментарий к самой свежей новости пишет наш автор.
+        bulk_create(Comment, (
+            Comment(
+                news_id=news_id,
+                author_id=user_ids[0] if index == 0 else rng.choice(
+                    user_ids
+                ),
+                text=words(15),
+            )
+            for index, news_id in enumerate(comment_news_ids)
+        ))
+    NewsMonth.objects.bulk_create(
+        NewsMonth(month=month, count=count)
+        for month, count in Counter(map(month_start, dates)).items()
+    )
+
+    anonymous = Client()
+    author = Client()
+    author.force_login(get_user_model().objects.get(pk=user_ids[0]))
+    hot_news = News.objects.get(pk=news_count)
+    assert hot_news.date == dates[-1]
+    own_comment = Comment.objects.get(pk=1)
+    _, cursor = get_comments_page(hot_news.pk)
+    comments_url = reverse('news:comments', args=(hot_news.pk,))
+    if cursor:
+        comments_url += '?' + urlencode({'after': cursor})
+    detail_url = reverse('news:detail', args=(hot_news.pk,))
+    search_url = reverse('news:search') + '?'
+    word = words.vocabulary[100]
+    return {
+        'home': (anonymous, reverse('news:home')),
+        'home:author': (author, reverse('news:home')),
+        'detail': (anonymous, detail_url),
+        'detail:author': (author, detail_url),
+        'comments': (anonymous, comments_url),
+        'search': (anonymous, search_url + urlencode({'q': word})),
+        'search:comments': (anonymous, search_url + urlencode(
+            {'q': word, 'in': 'comments'}
+        )),
+        'archive': (anonymous, reverse('news:archive')),
+        'archive_year': (anonymous, reverse(
+            'news:archive_year', args=(hot_news.date.year,)
+        )),
+        'archive_month': (anonymous, reverse(
+            'news:archive_month',
+            args=(hot_news.date.year, hot_news.date.month),
+        )),
+        'edit': (author, reverse('news:edit', args=(own_comment.pk,))),
+        'delete': (author, reverse('news:delete', args=(own_comment.pk,))),
+    }
+
+
+if __name__ == '__main__':
+    run_url_regressions('news', seed, BASELINE_PATH)
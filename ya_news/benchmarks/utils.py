@@ -0,0 +1,166 @@
+import argparse
+import json
+import os
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+from contextlib import contextmanager
+from importlib import import_module
+from pathlib import Path
+
+import django
+
+# Допустимый рост времени и памяти относительно базовой линии, в долях.
+DEFAULT_THRESHOLD = 0.5
+# Меньшие абсолютные отклонения считаем шумом.
+NOISE_FLOORS = {'time_ms': 2.0, 'peak_kib': 256.0}
+
+
+@contextmanager
+def scratch_database(settings_module='yanews.settings'):
+    """
+    Настраивает Django на временную базу SQLite с применёнными миграциями.
+
+    Возвращает путь к временной директории, где можно хранить и другие
+    файлы бенчмарка; директория удаляется вместе с базой.
+    """
+    os.environ.setdefault('DJANGO_SETTINGS_MODULE', settings_module)
+    with tempfile.TemporaryDirectory() as tmp:
+        from django.conf import settings
+        settings.DATABASES['default']['NAME'] = Path(tmp) / 'db.sqlite3'
+        django.setup()
+        from django.core.management import call_command
+        from django.db import connection
+        call_command('migrate', verbosity=0)
+        try:
+            yield Path(tmp)
+        finally:
+            connection.close()
+
+
+def measure_url(client, url, repeat):
+    """
+    Запросы, время и пиковая память одного адреса.
+
+    Число запросов и память меряются на холодном кеше, число запросов
+    ещё раз на прогретом, время как медиана прогретых запросов.
+    """
+    from django.core.cache import cache
+    from django.db import connection, reset_queries
+    from django.test.utils import CaptureQueriesContext
+    cache.clear()
+    # При DEBUG журнал запросов ограничен, и на заполненном журнале
+    # CaptureQueriesContext ничего бы не насчитал.
+    reset_queries()
+    tracemalloc.start()
+    with CaptureQueriesContext(connection) as cold:
+        response = client.get(url)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    # captured_queries читает журнал лениво, а его очищают и следующие
+    # запросы, поэтому число запросов берём сразу.
+    queries_cold = len(cold)
+    reset_queries()
+    with CaptureQueriesContext(connection) as warm:
+        client.get(url)
+    queries_warm = len(warm)
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        client.get(url)
+        timings.append(time.perf_counter() - started)
+    return {
+        'status': response.status_code,
+        'queries_cold': queries_cold,
+        'queries_warm': queries_warm,
+        'time_ms': round(statistics.median(timings) * 1e3, 2),
+        'peak_kib': round(peak / 1024, 1),
+    }
+
+
+def compare_with_baseline(results, baseline, threshold):
+    """Список регрессий: рост числа запросов или времени и памяти."""
+    failures = []
+    for name, result in results.items():
+        expected = baseline.get(name)
+        if expected is None:
+            failures.append(f'{name}: нет в базовой линии')
+            continue
+        if result['status'] != expected['status']:
+            failures.append(
+                f"{name}: статус {result['status']}, "
+                f"ожидался {expected['status']}"
+            )
+        for key in ('queries_cold', 'queries_warm'):
+            if result[key] > expected[key]:
+                failures.append(
+                    f'{name}: {key} {result[key]} вместо {expected[key]}'
+                )
+        for key, floor in NOISE_FLOORS.items():
+            limit = max(expected[key] * (1 + threshold), expected[key] + floor)
+            if result[key] > limit:
+                failures.append(
+                    f'{name}: {key} {result[key]}, '
+                    f'базовая линия {expected[key]}'
+                )
+    return failures
+
+
+def run_url_regressions(app_label, seed, baseline_path):
+    """
+    Замеряет все адреса приложения и сравнивает с базовой линией.
+
+    seed(scale) наполняет базу и возвращает словарь
+    {имя[:вариант]: (клиент, адрес)}. Каждое имя из urls приложения
+    должно встречаться в нём хотя бы раз, иначе новый адрес остался бы
+    без замеров. С --update результаты записываются как базовая линия.
+    """
+    parser = argparse.ArgumentParser()
+    parser.add_argument(
+        '--scale', type=float, default=1.0,
+        help='Доля от полного объёма данных.',
+    )
+    parser.add_argument('--repeat', type=int, default=20)
+    parser.add_argument(
+        '--threshold', type=float, default=DEFAULT_THRESHOLD
+    )
+    parser.add_argument('--update', action='store_true')
+    args = parser.parse_args()
+    with scratch_database():
+        from django.conf import settings
+        # Тестовые клиенты ходят на хост testserver.
+        settings.ALLOWED_HOSTS.append('testserver')
+        started = time.monotonic()
+        cases = seed(args.scale)
+        print(f'Данные созданы за {time.monotonic() - started:.0f} с')
+        url_names = {
+            pattern.name
+            for pattern in import_module(f'{app_label}.urls').urlpatterns
+        }
+        missing = url_names - {name.split(':')[0] for name in cases}
+        if missing:
+            sys.exit(f'Нет замеров для адресов: {", ".join(sorted(missing))}')
+        results = {}
+        for name, (client, url) in cases.items():
+            results[name] = measure_url(client, url, args.repeat)
+            print(name.ljust(20), json.dumps(results[name]))
+    if args.update:
+        baseline_path.write_text(json.dumps(
+            {'scale': args.scale, 'urls': results}, indent=2
+        ) + '\n')
+        print(f'Базовая линия записана в {baseline_path}')
+        return
+    baseline = json.loads(baseline_path.read_text())
+    if baseline['scale'] != args.scale:
+        sys.exit(
+            f"Базовая линия снята при --scale {baseline['scale']}, "
+            f'сравнение с {args.scale} бессмысленно.'
+        )
+    failures = compare_with_baseline(
+        results, baseline['urls'], args.threshold
+    )
+    if failures:
+        sys.exit('Регрессии:\n' + '\n'.join(failures))
+    print('Регрессий нет.')
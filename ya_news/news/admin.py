@@ -1,6 +1,6 @@
 from django.contrib import admin
 
-from .models import Comment, News
+from .models import BadWord, Comment, News, RequestTiming
 
 
 class CommentInline(admin.StackedInline):
@@ -10,6 +10,27 @@ class CommentInline(admin.StackedInline):
 
 @admin.register(News)
 class NewsAdmin(admin.ModelAdmin):
+    list_display = ('title', 'date', 'comment_count')
     inlines = [
         CommentInline,
     ]
+
+
+@admin.register(BadWord)
+class BadWordAdmin(admin.ModelAdmin):
+    search_fields = ('word',)
+
+
+@admin.register(RequestTiming)
+class RequestTimingAdmin(admin.ModelAdmin):
+    list_display = (
+        'url_name', 'metric', 'p50', 'p95', 'p99', 'samples', 'updated_at'
+    )
+    list_filter = ('metric',)
+    search_fields = ('url_name',)
+
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
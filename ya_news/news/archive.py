@@ -0,0 +1,40 @@
+from datetime import date
+
+from django.db.models import F
+
+from .models import News, NewsMonth
+
+
+def month_start(value):
+    """Первое число месяца для даты, даты со временем или строки."""
+    value = News._meta.get_field('date').to_python(value)
+    return date(value.year, value.month, 1)
+
+
+def next_month(month):
+    if month.month == 12:
+        return date(month.year + 1, 1, 1)
+    return date(month.year, month.month + 1, 1)
+
+
+def shift_month_counts(counts):
+    """
+    Прибавляет к счётчикам месяцев значения из словаря {месяц: разница}.
+
+    Счётчик меняется атомарным UPDATE; строка месяца создаётся только
+    для первой новости в нём.
+    """
+    for month, delta in counts.items():
+        if not delta:
+            continue
+        months = NewsMonth.objects.filter(month=month)
+        if not months.update(count=F('count') + delta) and delta > 0:
+            NewsMonth.objects.get_or_create(month=month)
+            months.update(count=F('count') + delta)
+
+
+def get_month_count(month):
+    """Число новостей за месяц из таблицы NewsMonth."""
+    return NewsMonth.objects.filter(month=month).values_list(
+        'count', flat=True
+    ).first() or 0
@@ -0,0 +1,103 @@
+import re
+from collections import Counter
+
+from django.conf import settings
+from django.core.cache import cache
+from django.template.loader import render_to_string
+from django.utils.safestring import mark_safe
+
+from .pagination import get_comments_page
+
+NEWS_CARD_KEY = 'news:card:{pk}:{updated_at}'
+NEWS_CARD_TEMPLATE = 'news/includes/news_card.html'
+COMMENTS_PAGE_KEY = 'news:comments:{pk}:{updated_at}:{cursor}'
+COMMENTS_TEMPLATE = 'news/includes/comments.html'
+COMMENT_CONTROLS_TEMPLATE = 'news/includes/comment_controls.html'
+# Метка в закешированном списке комментариев, на место которой
+# подставляются ссылки редактирования и удаления для автора комментария.
+COMMENT_CONTROLS_RE = re.compile(r'<!--comment-controls:(\d+):(\d+)-->')
+
+# Счётчики попаданий и промахов кеша в текущем процессе.
+stats = Counter()
+
+
+def get_card_key(news):
+    return NEWS_CARD_KEY.format(
+        pk=news.pk, updated_at=news.updated_at.timestamp()
+    )
+
+
+def render_cards(news_list):
+    """Рендерит карточки новостей и сохраняет их в кеш."""
+    cards = {
+        get_card_key(news): render_to_string(
+            NEWS_CARD_TEMPLATE, {'news': news}
+        )
+        for news in news_list
+    }
+    cache.set_many(cards, settings.NEWS_CACHE_TIMEOUT)
+    return cards
+
+
+def get_home_cards(news_list):
+    """
+    Карточки новостей для главной страницы.
+
+    Ключ карточки содержит updated_at новости, который меняется и вместе
+    с её комментариями. Поэтому изменённую новость перерисовывает
+    любой процесс, даже если старая карточка осталась в его кеше,
+    и сбрасывать карточки при изменениях не нужно.
+    """
+    keys = [get_card_key(news) for news in news_list]
+    cards = cache.get_many(keys)
+    missing = [
+        news for news, key in zip(news_list, keys) if key not in cards
+    ]
+    stats['card_hits'] += len(keys) - len(missing)
+    stats['card_misses'] += len(missing)
+    if missing:
+        cards.update(render_cards(missing))
+    return [cards[key] for key in keys]
+
+
+def get_comments_fragment(news, cursor=None):
+    """
+    Отрендеренная страница комментариев новости.
+
+    Фрагмент одинаков для всех пользователей: вместо ссылок
+    редактирования и удаления в нём стоят метки для apply_comment_controls.
+    Как и у карточек, ключ содержит updated_at новости, поэтому
+    сбрасывать фрагменты при изменении комментариев не нужно.
+    """
+    news_pk = news.pk
+    key = COMMENTS_PAGE_KEY.format(
+        pk=news_pk,
+        updated_at=news.updated_at.timestamp(),
+        cursor=cursor or '',
+    )
+    fragment = cache.get(key)
+    if fragment is None:
+        stats['comments_misses'] += 1
+        comments, next_cursor = get_comments_page(news_pk, cursor)
+        fragment = render_to_string(COMMENTS_TEMPLATE, {
+            'comments': comments,
+            'next_cursor': next_cursor,
+            'news_pk': news_pk,
+            'first_page': cursor is None,
+        })
+        cache.set(key, fragment, settings.NEWS_CACHE_TIMEOUT)
+    else:
+        stats['comments_hits'] += 1
+    return fragment
+
+
+def apply_comment_controls(fragment, user):
+    """Показывает ссылки управления только у комментариев пользователя."""
+    def replace(match):
+        author_pk, comment_pk = map(int, match.groups())
+        if author_pk != user.pk:
+            return ''
+        return render_to_string(
+            COMMENT_CONTROLS_TEMPLATE, {'comment_pk': comment_pk}
+        )
+    return mark_safe(COMMENT_CONTROLS_RE.sub(replace, fragment))
@@ -1,16 +1,71 @@
-from django.forms import ModelForm
+import time
+
+from django.conf import settings
 from django.core.exceptions import ValidationError
+from django.core.signals import setting_changed
+from django.dispatch import receiver
+from django.forms import ModelForm
+from django.utils.module_loading import import_string
 
-from .models import Comment
+from .models import BadWord, Comment
 
+# Начальный словарь; дальше список редактируется через админку (BadWord).
 BAD_WORDS = (
     'редиска',
     'негодяй',
-    # Дополните список на своё усмотрение.
 )
 WARNING = 'Не ругайтесь!'
 
 
+def build_bad_words_matcher():
+    return import_string(settings.BAD_WORDS_MATCHER)()
+
+
+bad_words_matcher = build_bad_words_matcher()
+# Время последнего чтения словаря из базы по time.monotonic().
+bad_words_loaded_at = None
+
+
+def expire_bad_words():
+    """Словарь перечитается из базы при следующей проверке."""
+    global bad_words_loaded_at
+    bad_words_loaded_at = None
+
+
+@receiver(setting_changed)
+def rebuild_bad_words_matcher(setting, **kwargs):
+    global bad_words_matcher
+    if setting == 'BAD_WORDS_MATCHER':
+        bad_words_matcher = build_bad_words_matcher()
+        expire_bad_words()
+
+
+def get_bad_words_matcher():
+    """
+    Матчер запрещённых слов текущего процесса.
+
+    Словарь перечитывается из базы не чаще раза в BAD_WORDS_TTL секунд,
+    а матчер перестраивается, только если словарь изменился.
+    Процесс, в котором словарь правили, видит правку сразу,
+    остальные — не позже чем через BAD_WORDS_TTL.
+    """
+    global bad_words_loaded_at
+    now = time.monotonic()
+    if (bad_words_loaded_at is None
+            or now - bad_words_loaded_at >= settings.BAD_WORDS_TTL):
+        bad_words_matcher.update(
+            BadWord.objects.values_list('word', flat=True)
+        )
+        bad_words_loaded_at = now
+    return bad_words_matcher
+
+
+def check_bad_words(text):
+    """Не позволяем ругаться в комментариях."""
+    if get_bad_words_matcher().search(text):
+        raise ValidationError(WARNING)
+
+
 class CommentForm(ModelForm):
 
     class Meta:
@@ -20,8 +75,5 @@ class CommentForm(ModelForm):
     def clean_text(self):
         """Не позволяем ругаться в комментариях."""
         text = self.cleaned_data['text']
-        lowered_text = text.lower()
-        for word in BAD_WORDS:
-            if word in lowered_text:
-                raise ValidationError(WARNING)
+        check_bad_words(text)
         return text
@@ -0,0 +1,178 @@
+import csv
+import json
+import time
+from collections import Counter
+from itertools import islice
+from pathlib import Path
+
+from django import forms
+from django.contrib.auth import get_user_model
+from django.core.exceptions import ValidationError
+from django.core.management.base import BaseCommand, CommandError
+from django.db import reset_queries, transaction
+from django.db.models import F
+from django.utils import timezone
+
+from news.forms import CommentForm, check_bad_words
+from news.models import Comment, News
+
+DEFAULT_BATCH_SIZE = 1000
+FORMATS = ('jsonl', 'csv')
+
+User = get_user_model()
+
+
+def read_jsonl(file):
+    for line in file:
+        if line.strip():
+            yield json.loads(line)
+
+
+def read_csv(file):
+    yield from csv.DictReader(file)
+
+
+def chunked(rows, size):
+    rows = iter(rows)
+    while True:
+        chunk = list(islice(rows, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def to_int(value):
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return None
+
+
+class Command(BaseCommand):
+    help = (
+        'Импортирует комментарии из файла JSONL или CSV с полями '
+        'news, author, text и необязательным created.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('path', type=Path)
+        parser.add_argument(
+            '--format',
+            choices=FORMATS,
+            help='Формат файла; по умолчанию определяется по расширению.',
+        )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=DEFAULT_BATCH_SIZE,
+            help='Количество строк в одной транзакции.',
+        )
+        parser.add_argument(
+            '--rejects',
+            type=Path,
+            help='Файл JSONL для отклонённых строк с причиной отказа.',
+        )
+
+    def handle(self, *args, **options):
+        path = options['path']
+        file_format = options['format'] or path.suffix.lstrip('.')
+        if file_format not in FORMATS:
+            raise CommandError(f'Неизвестный формат файла: {path.name}')
+        reader = read_jsonl if file_format == 'jsonl' else read_csv
+        rejects = (
+            options['rejects'].open('w', encoding='utf-8')
+            if options['rejects'] else None
+        )
+        imported = rejected = 0
+        started = time.monotonic()
+        try:
+            with path.open(encoding='utf-8', newline='') as file:
+                for chunk in chunked(reader(file), options['batch_size']):
+                    comments, errors = self.validate(chunk)
+                    self.save(comments)
+                    # При DEBUG = True Django копит тексты всех запросов.
+                    reset_queries()
+                    imported += len(comments)
+                    rejected += len(errors)
+                    for row, reason in errors:
+                        if rejects:
+                            rejects.write(json.dumps(
+                                {'row': row, 'reason': reason},
+                                ensure_ascii=False,
+                            ) + '\n')
+                    if options['verbosity'] > 1:
+                        self.stdout.write(
+                            f'Обработано строк: {imported + rejected}'
+                        )
+        finally:
+            if rejects:
+                rejects.close()
+        elapsed = time.monotonic() - started
+        self.stdout.write(
+            f'Импортировано: {imported}, отклонено: {rejected}, '
+            f'время: {elapsed:.1f} с, '
+            f'скорость: {(imported + rejected) / (elapsed or 1):.0f} строк/с'
+        )
+
+    def validate(self, chunk):
+        """
+        Проверяет строки теми же правилами, что и форма на сайте.
+
+        Поле text и проверка запрещённых слов берутся из CommentForm
+        без создания экземпляра формы на каждую строку.
+        Без даты created комментарий получает время импорта.
+        """
+        text_field = CommentForm.base_fields['text']
+        created_field = forms.DateTimeField(required=False)
+        now = timezone.now()
+        news_ids = set(News.objects.filter(
+            pk__in={to_int(row.get('news')) for row in chunk}
+        ).values_list('pk', flat=True))
+        author_ids = set(User.objects.filter(
+            pk__in={to_int(row.get('author')) for row in chunk}
+        ).values_list('pk', flat=True))
+        comments = []
+        errors = []
+        for row in chunk:
+            news_id = to_int(row.get('news'))
+            author_id = to_int(row.get('author'))
+            if news_id not in news_ids:
+                errors.append((row, 'Новость не найдена.'))
+                continue
+            if author_id not in author_ids:
+                errors.append((row, 'Автор не найден.'))
+                continue
+            try:
+                text = text_field.clean(row.get('text'))
+                check_bad_words(text)
+                created = created_field.clean(row.get('created'))
+            except ValidationError as error:
+                errors.append((row, ' '.join(error.messages)))
+                continue
+            if created is None:
+                created = now
+            elif created > now:
+                errors.append((row, 'Дата комментария в будущем.'))
+                continue
+            comments.append(Comment(
+                news_id=news_id, author_id=author_id, text=text,
+                created=created,
+            ))
+        return comments, errors
+
+    def save(self, comments):
+        """
+        Сохраняет пачку комментариев одной транзакцией.
+
+        bulk_create не отправляет сигналы, поэтому счётчики комментариев
+        и кеш новостей обновляются здесь же, один раз на новость.
+        """
+        counts = Counter(comment.news_id for comment in comments)
+        now = timezone.now()
+        with transaction.atomic():
+            Comment.objects.bulk_create(comments)
+            for news_id, count in counts.items():
+                News.objects.filter(pk=news_id).update(
+                    comment_count=F('comment_count') + count,
+                    updated_at=now,
+                )
@@ -0,0 +1,136 @@
+import json
+import re
+import time
+from collections import Counter
+from itertools import islice
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, reset_queries, transaction
+
+from news import search
+from news.archive import month_start, shift_month_counts
+from news.models import News
+
+DEFAULT_BATCH_SIZE = 5000
+READ_SIZE = 64 * 1024
+MODEL_LABEL = 'news.news'
+WHITESPACE_RE = re.compile(r'[\s,]*')
+
+
+def iter_json_array(file, read_size=READ_SIZE):
+    """
+    Поочерёдно разбирает элементы JSON-массива верхнего уровня.
+
+    В памяти держится только текущий кусок файла, поэтому потребление
+    памяти не зависит от размера фикстуры.
+    """
+    decoder = json.JSONDecoder()
+    buffer = file.read(read_size).lstrip()
+    if not buffer.startswith('['):
+        raise CommandError('Фикстура должна быть JSON-массивом.')
+    position = 1
+    eof = False
+    while True:
+        position = WHITESPACE_RE.match(buffer, position).end()
+        if position < len(buffer) and buffer[position] == ']':
+            return
+        try:
+            obj, end = decoder.raw_decode(buffer, position)
+        except json.JSONDecodeError:
+            if eof:
+                raise CommandError('Фикстура обрывается на середине.')
+            chunk = file.read(read_size)
+            eof = not chunk
+            buffer = buffer[position:] + chunk
+            position = 0
+            continue
+        yield obj
+        position = end
+
+
+class Command(BaseCommand):
+    help = (
+        'Потоково загружает новости из фикстуры в формате loaddata '
+        '(модель news.news) пачками через bulk_create.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('path')
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=DEFAULT_BATCH_SIZE,
+            help='Количество новостей в одной транзакции.',
+        )
+        parser.add_argument(
+            '--defer-indexes',
+            action='store_true',
+            help=(
+                'Удалить индексы News и триггеры полнотекстового индекса '
+                'на время загрузки, а после неё создать и перестроить.'
+            ),
+        )
+
+    def handle(self, *args, **options):
+        defer_indexes = options['defer_indexes']
+        indexes = News._meta.indexes if defer_indexes else ()
+        search_indexes = (
+            (search.NEWS_INDEX,)
+            if defer_indexes and search.is_supported() else ()
+        )
+        for index in indexes:
+            self.execute_index_sql(index.remove_sql)
+        with connection.cursor() as cursor:
+            for index in search_indexes:
+                for sql in index.drop_triggers_sql():
+                    cursor.execute(sql)
+        loaded = 0
+        started = time.monotonic()
+        try:
+            with open(options['path'], encoding='utf-8') as file:
+                objects = map(self.build_news, iter_json_array(file))
+                while True:
+                    batch = list(islice(objects, options['batch_size']))
+                    if not batch:
+                        break
+                    with transaction.atomic():
+                        News.objects.bulk_create(batch)
+                        # bulk_create не отправляет сигналы.
+                        shift_month_counts(Counter(
+                            month_start(news.date) for news in batch
+                        ))
+                    loaded += len(batch)
+                    # При DEBUG = True Django копит тексты всех запросов.
+                    reset_queries()
+                    if options['verbosity'] > 1:
+                        self.stdout.write(f'Загружено новостей: {loaded}')
+        finally:
+            for index in indexes:
+                self.execute_index_sql(index.create_sql)
+            with connection.cursor() as cursor:
+                search.install(cursor, rebuild=True, indexes=search_indexes)
+        elapsed = time.monotonic() - started
+        self.stdout.write(
+            f'Загружено новостей: {loaded}, время: {elapsed:.1f} с'
+        )
+
+    @staticmethod
+    def execute_index_sql(make_sql):
+        """
+        Выполняет SQL удаления или создания индекса.
+
+        Контекст schema_editor не нужен: перестройки таблицы не требуется,
+        а на SQLite он недоступен внутри транзакции.
+        """
+        sql = make_sql(News, connection.schema_editor())
+        with connection.cursor() as cursor:
+            cursor.execute(str(sql))
+
+    @staticmethod
+    def build_news(obj):
+        model = obj.get('model')
+        if model != MODEL_LABEL:
+            raise CommandError(
+                f'Ожидались объекты {MODEL_LABEL}, получено: {model}'
+            )
+        return News(pk=obj.get('pk'), **obj['fields'])
@@ -0,0 +1,20 @@
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+
+from news import search
+
+
+class Command(BaseCommand):
+    help = (
+        'Пересоздаёт триггеры полнотекстовых индексов новостей '
+        'и комментариев и заново индексирует все записи.'
+    )
+
+    def handle(self, *args, **options):
+        if not search.is_supported():
+            raise CommandError(
+                'Полнотекстовый поиск работает только с SQLite.'
+            )
+        with connection.cursor() as cursor:
+            search.install(cursor, rebuild=True)
+        self.stdout.write('Индексы новостей и комментариев перестроены.')
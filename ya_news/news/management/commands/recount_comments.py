@@ -0,0 +1,50 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.db.models import Count, IntegerField, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+from django.utils import timezone
+
+from news.models import Comment, News
+
+DEFAULT_BATCH_SIZE = 1000
+
+
+class Command(BaseCommand):
+    help = 'Пересчитывает поле comment_count у всех новостей.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=DEFAULT_BATCH_SIZE,
+            help='Количество новостей, обновляемых одним запросом.',
+        )
+
+    def handle(self, *args, **options):
+        batch_size = options['batch_size']
+        comments = Comment.objects.filter(
+            news=OuterRef('pk')
+        ).order_by().values('news').annotate(total=Count('pk')).values(
+            'total'
+        )
+        last_pk = 0
+        updated = 0
+        while True:
+            pks = list(
+                News.objects.filter(pk__gt=last_pk).order_by('pk').values_list(
+                    'pk', flat=True
+                )[:batch_size]
+            )
+            if not pks:
+                break
+            with transaction.atomic():
+                updated += News.objects.filter(pk__in=pks).update(
+                    comment_count=Coalesce(
+                        Subquery(comments, output_field=IntegerField()), 0
+                    ),
+                    # По updated_at проверяется актуальность карточек
+                    # и страниц новостей.
+                    updated_at=timezone.now(),
+                )
+            last_pk = pks[-1]
+        self.stdout.write(f'Пересчитано новостей: {updated}')
@@ -0,0 +1,33 @@
+# Generated by Django 3.2.15 on 2026-10-18 16:42
+
+from django.db import migrations, models
+
+BAD_WORDS = ('редиска', 'негодяй')
+
+
+def add_bad_words(apps, schema_editor):
+    BadWord = apps.get_model('news', 'BadWord')
+    BadWord.objects.bulk_create(BadWord(word=word) for word in BAD_WORDS)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('news', '0003_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='BadWord',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('word', models.CharField(max_length=100, unique=True, verbose_name='Слово')),
+            ],
+            options={
+                'verbose_name': 'Запрещённое слово',
+                'verbose_name_plural': 'Запрещённые слова',
+                'ordering': ('word',),
+            },
+        ),
+        migrations.RunPython(add_bad_words, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,99 @@
+from django.db import migrations
+
+# SQL зафиксирован здесь, а не берётся из news.search:
+# миграция должна выполняться так же, как при её создании.
+CREATE_SQL = (
+    """
+    CREATE VIRTUAL TABLE IF NOT EXISTS news_news_fts USING fts5(
+        title, text, content='news_news', content_rowid='id',
+        tokenize='unicode61 remove_diacritics 2'
+    )
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS news_news_fts_insert
+    AFTER INSERT ON news_news BEGIN
+        INSERT INTO news_news_fts(rowid, title, text)
+        VALUES (new.id, new.title, new.text);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS news_news_fts_delete
+    AFTER DELETE ON news_news BEGIN
+        INSERT INTO news_news_fts(news_news_fts, rowid, title, text)
+        VALUES ('delete', old.id, old.title, old.text);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS news_news_fts_update
+    AFTER UPDATE OF title, text ON news_news BEGIN
+        INSERT INTO news_news_fts(news_news_fts, rowid, title, text)
+        VALUES ('delete', old.id, old.title, old.text);
+        INSERT INTO news_news_fts(rowid, title, text)
+        VALUES (new.id, new.title, new.text);
+    END
+    """,
+    "INSERT INTO news_news_fts(news_news_fts) VALUES ('rebuild')",
+    """
+    CREATE VIRTUAL TABLE IF NOT EXISTS news_comment_fts USING fts5(
+        text, news_id UNINDEXED, content='news_comment', content_rowid='id',
+        tokenize='unicode61 remove_diacritics 2'
+    )
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS news_comment_fts_insert
+    AFTER INSERT ON news_comment BEGIN
+        INSERT INTO news_comment_fts(rowid, text, news_id)
+        VALUES (new.id, new.text, new.news_id);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS news_comment_fts_delete
+    AFTER DELETE ON news_comment BEGIN
+        INSERT INTO news_comment_fts(news_comment_fts, rowid, text, news_id)
+        VALUES ('delete', old.id, old.text, old.news_id);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS news_comment_fts_update
+    AFTER UPDATE OF text, news_id ON news_comment BEGIN
+        INSERT INTO news_comment_fts(news_comment_fts, rowid, text, news_id)
+        VALUES ('delete', old.id, old.text, old.news_id);
+        INSERT INTO news_comment_fts(rowid, text, news_id)
+        VALUES (new.id, new.text, new.news_id);
+    END
+    """,
+    "INSERT INTO news_comment_fts(news_comment_fts) VALUES ('rebuild')",
+)
+
+DROP_SQL = (
+    'DROP TRIGGER IF EXISTS news_news_fts_insert',
+    'DROP TRIGGER IF EXISTS news_news_fts_delete',
+    'DROP TRIGGER IF EXISTS news_news_fts_update',
+    'DROP TABLE IF EXISTS news_news_fts',
+    'DROP TRIGGER IF EXISTS news_comment_fts_insert',
+    'DROP TRIGGER IF EXISTS news_comment_fts_delete',
+    'DROP TRIGGER IF EXISTS news_comment_fts_update',
+    'DROP TABLE IF EXISTS news_comment_fts',
+)
+
+
+def run_sql(statements):
+    """Полнотекстовый поиск есть только в SQLite."""
+    def run(apps, schema_editor):
+        if schema_editor.connection.vendor != 'sqlite':
+            return
+        with schema_editor.connection.cursor() as cursor:
+            for sql in statements:
+                cursor.execute(sql)
+    return run
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('news', '0004_badword'),
+    ]
+
+    operations = [
+        migrations.RunPython(run_sql(CREATE_SQL), run_sql(DROP_SQL)),
+    ]
@@ -0,0 +1,57 @@
+# Generated by Django 3.2.15 on 2026-10-18 17:41
+
+from django.db import migrations, models
+
+# Триггеры индекса новостей из 0005_search.
+NEWS_TRIGGERS_SQL = (
+    """
+    CREATE TRIGGER IF NOT EXISTS news_news_fts_insert
+    AFTER INSERT ON news_news BEGIN
+        INSERT INTO news_news_fts(rowid, title, text)
+        VALUES (new.id, new.title, new.text);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS news_news_fts_delete
+    AFTER DELETE ON news_news BEGIN
+        INSERT INTO news_news_fts(news_news_fts, rowid, title, text)
+        VALUES ('delete', old.id, old.title, old.text);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS news_news_fts_update
+    AFTER UPDATE OF title, text ON news_news BEGIN
+        INSERT INTO news_news_fts(news_news_fts, rowid, title, text)
+        VALUES ('delete', old.id, old.title, old.text);
+        INSERT INTO news_news_fts(rowid, title, text)
+        VALUES (new.id, new.title, new.text);
+    END
+    """,
+)
+
+
+def reinstall_search_triggers(apps, schema_editor):
+    """SQLite пересоздаёт таблицу при AddField и теряет её триггеры."""
+    if schema_editor.connection.vendor != 'sqlite':
+        return
+    with schema_editor.connection.cursor() as cursor:
+        for sql in NEWS_TRIGGERS_SQL:
+            cursor.execute(sql)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('news', '0005_search'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='news',
+            name='updated_at',
+            field=models.DateTimeField(auto_now=True),
+        ),
+        migrations.RunPython(
+            reinstall_search_triggers, migrations.RunPython.noop
+        ),
+    ]
@@ -0,0 +1,40 @@
+# Generated by Django 3.2.15 on 2026-10-18 17:44
+
+from django.db import migrations, models
+from django.db.models import Count
+from django.db.models.functions import TruncMonth
+
+
+def fill_news_months(apps, schema_editor):
+    News = apps.get_model('news', 'News')
+    NewsMonth = apps.get_model('news', 'NewsMonth')
+    months = News.objects.order_by().annotate(
+        month=TruncMonth('date')
+    ).values('month').annotate(count=Count('id'))
+    NewsMonth.objects.bulk_create(
+        NewsMonth(month=row['month'], count=row['count']) for row in months
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('news', '0006_news_updated_at'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='NewsMonth',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('month', models.DateField(unique=True, verbose_name='Месяц')),
+                ('count', models.PositiveIntegerField(default=0, verbose_name='Новостей')),
+            ],
+            options={
+                'verbose_name': 'Новости за месяц',
+                'verbose_name_plural': 'Новости по месяцам',
+                'ordering': ('-month',),
+            },
+        ),
+        migrations.RunPython(fill_news_months, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,60 @@
+# Generated by Django 3.2.15 on 2026-10-18 18:58
+
+from django.db import migrations, models
+import django.utils.timezone
+
+# Триггеры индекса комментариев из 0005_search.
+COMMENT_TRIGGERS_SQL = (
+    """
+    CREATE TRIGGER IF NOT EXISTS news_comment_fts_insert
+    AFTER INSERT ON news_comment BEGIN
+        INSERT INTO news_comment_fts(rowid, text, news_id)
+        VALUES (new.id, new.text, new.news_id);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS news_comment_fts_delete
+    AFTER DELETE ON news_comment BEGIN
+        INSERT INTO news_comment_fts(news_comment_fts, rowid, text, news_id)
+        VALUES ('delete', old.id, old.text, old.news_id);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS news_comment_fts_update
+    AFTER UPDATE OF text, news_id ON news_comment BEGIN
+        INSERT INTO news_comment_fts(news_comment_fts, rowid, text, news_id)
+        VALUES ('delete', old.id, old.text, old.news_id);
+        INSERT INTO news_comment_fts(rowid, text, news_id)
+        VALUES (new.id, new.text, new.news_id);
+    END
+    """,
+)
+
+
+def reinstall_search_triggers(apps, schema_editor):
+    """SQLite пересоздаёт таблицу при AlterField и теряет её триггеры."""
+    if schema_editor.connection.vendor != 'sqlite':
+        return
+    with schema_editor.connection.cursor() as cursor:
+        for sql in COMMENT_TRIGGERS_SQL:
+            cursor.execute(sql)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('news', '0008_requesttiming'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='comment',
+            name='created',
+            field=models.DateTimeField(
+                default=django.utils.timezone.now, editable=False
+            ),
+        ),
+        migrations.RunPython(
+            reinstall_search_triggers, migrations.RunPython.noop
+        ),
+    ]
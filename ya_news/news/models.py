@@ -2,21 +2,37 @@ from datetime import datetime
 
 from django.conf import settings
 from django.db import models
+from django.utils import timezone
 
 
 class News(models.Model):
     title = models.CharField(max_length=50)
     text = models.TextField()
     date = models.DateField(default=datetime.today)
+    comment_count = models.PositiveIntegerField(default=0, editable=False)
+    # Меняется и при изменении комментариев, см. news/signals.py.
+    updated_at = models.DateTimeField(auto_now=True)
+    # Дата, загруженная из базы: по ней сигналы замечают смену месяца.
+    saved_date = None
 
     class Meta:
         ordering = ('-date',)
+        indexes = (
+            models.Index(fields=('-date', 'id'), name='news_date_id_idx'),
+        )
         verbose_name_plural = 'Новости'
         verbose_name = 'Новость'
 
     def __str__(self):
         return self.title
 
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        news = super().from_db(db, field_names, values)
+        # Отложенное поле date не читаем, чтобы не делать лишний запрос.
+        news.saved_date = news.__dict__.get('date')
+        return news
+
 
 class Comment(models.Model):
     news = models.ForeignKey(
@@ -28,10 +44,77 @@ class Comment(models.Model):
         on_delete=models.CASCADE,
     )
     text = models.TextField()
-    created = models.DateTimeField(auto_now_add=True)
+    # Не auto_now_add: импорт переносит дату из исходных данных.
+    created = models.DateTimeField(default=timezone.now, editable=False)
 
     class Meta:
         ordering = ('created',)
+        indexes = (
+            models.Index(
+                fields=('news', 'created', 'id'),
+                name='comment_news_created_idx',
+            ),
+            models.Index(fields=('author', 'id'), name='comment_author_idx'),
+        )
 
     def __str__(self):
         return self.text[:50]
+
+
+class BadWord(models.Model):
+    word = models.CharField('Слово', max_length=100, unique=True)
+
+    class Meta:
+        ordering = ('word',)
+        verbose_name_plural = 'Запрещённые слова'
+        verbose_name = 'Запрещённое слово'
+
+    def __str__(self):
+        return self.word
+
+
+class NewsMonth(models.Model):
+    # Число новостей за месяц. Обновляется сигналами и load_news,
+    # чтобы архив не группировал всю таблицу новостей на каждый запрос.
+    month = models.DateField('Месяц', unique=True)
+    count = models.PositiveIntegerField('Новостей', default=0)
+
+    class Meta:
+        ordering = ('-month',)
+        verbose_name_plural = 'Новости по месяцам'
+        verbose_name = 'Новости за месяц'
+
+    def __str__(self):
+        return f'{self.month:%m.%Y}: {self.count}'
+
+
+class RequestTiming(models.Model):
+    # Перцентили одной метрики запросов к адресу за скользящее окно.
+    # Пишутся middleware профилирования, см. news/profiling.py.
+    METRICS = (
+        ('total_ms', 'Всего, мс'),
+        ('sql_ms', 'SQL, мс'),
+        ('render_ms', 'Шаблоны, мс'),
+        ('queries', 'Запросов к базе'),
+    )
+
+    url_name = models.CharField('Адрес', max_length=200)
+    metric = models.CharField('Метрика', max_length=20, choices=METRICS)
+    samples = models.PositiveIntegerField('Замеров в окне')
+    p50 = models.FloatField('p50')
+    p95 = models.FloatField('p95')
+    p99 = models.FloatField('p99')
+    updated_at = models.DateTimeField('Обновлено', auto_now=True)
+
+    class Meta:
+        ordering = ('url_name', 'metric')
+        constraints = (
+            models.UniqueConstraint(
+                fields=('url_name', 'metric'), name='unique_request_timing'
+            ),
+        )
+        verbose_name_plural = 'Время ответа по адресам'
+        verbose_name = 'Время ответа'
+
+    def __str__(self):
+        return f'{self.url_name} {self.metric}: p95 {self.p95:.1f}'
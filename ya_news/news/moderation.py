@@ -0,0 +1,146 @@
+import re
+from collections import deque
+
+
+class BadWordsMatcher:
+    """
+    Поиск запрещённых слов в тексте.
+
+    Наследники компилируют словарь один раз в build() и ищут вхождения
+    скомпилированного словаря в find(); свой класс подключается
+    настройкой BAD_WORDS_MATCHER.
+    """
+
+    def __init__(self, words=()):
+        self.state = ((), self.build(()))
+        self.update(words)
+
+    @property
+    def words(self):
+        return self.state[0]
+
+    def update(self, words):
+        """
+        Перестраивает матчер, только если словарь изменился.
+
+        Новый словарь компилируется отдельно и подменяет старый одним
+        присваиванием, поэтому search() из другого потока видит либо
+        старый словарь, либо новый, но не наполовину построенный.
+        """
+        words = tuple(sorted({word.lower() for word in words if word}))
+        if words != self.words:
+            self.state = (words, self.build(words))
+
+    def build(self, words):
+        """Скомпилированный словарь; после публикации он не меняется."""
+        raise NotImplementedError
+
+    def search(self, text):
+        """Возвращает первое найденное запрещённое слово или None."""
+        return self.find(self.state[1], text)
+
+    def find(self, compiled, text):
+        raise NotImplementedError
+
+
+class SubstringBadWordsMatcher(BadWordsMatcher):
+    """Проверка каждого слова отдельно: O(len(text) * len(words))."""
+
+    def build(self, words):
+        return words
+
+    def find(self, words, text):
+        lowered_text = text.lower()
+        for word in words:
+            if word in lowered_text:
+                return word
+        return None
+
+
+class RegexBadWordsMatcher(BadWordsMatcher):
+    """
+    Словарь в виде одного регулярного выражения, построенного по префиксному
+    дереву слов.
+
+    Общие префиксы слов объединены, поэтому в каждой позиции текста
+    проверяется не больше вариантов, чем букв в алфавите, независимо
+    от размера словаря.
+    """
+
+    def build(self, words):
+        trie = {}
+        for word in words:
+            node = trie
+            for char in word:
+                node = node.setdefault(char, {})
+            node[''] = {}
+        return re.compile(self.trie_to_regex(trie)) if words else None
+
+    @classmethod
+    def trie_to_regex(cls, node):
+        if '' in node:
+            # Слово закончилось: более длинные продолжения не нужны,
+            # достаточно найти самое короткое запрещённое вхождение.
+            return ''
+        branches = [
+            re.escape(char) + cls.trie_to_regex(child)
+            for char, child in sorted(node.items())
+        ]
+        if len(branches) == 1:
+            return branches[0]
+        return '(?:' + '|'.join(branches) + ')'
+
+    def find(self, pattern, text):
+        if pattern is None:
+            return None
+        match = pattern.search(text.lower())
+        return match.group() if match else None
+
+
+class AhoCorasickBadWordsMatcher(BadWordsMatcher):
+    """
+    Автомат Ахо — Корасик по словарю.
+
+    Текст просматривается один раз, и переход по каждому символу
+    в среднем стоит O(1), поэтому время проверки почти не зависит
+    от размера словаря.
+    """
+
+    def build(self, words):
+        # Состояние автомата — индекс в списках goto, fail и output.
+        goto = [{}]
+        fail = [0]
+        output = [None]
+        for word in words:
+            state = 0
+            for char in word:
+                if char not in goto[state]:
+                    goto.append({})
+                    fail.append(0)
+                    output.append(None)
+                    goto[state][char] = len(goto) - 1
+                state = goto[state][char]
+            output[state] = word
+        queue = deque(goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for char, next_state in goto[state].items():
+                queue.append(next_state)
+                fallback = fail[state]
+                while fallback and char not in goto[fallback]:
+                    fallback = fail[fallback]
+                fail[next_state] = goto[fallback].get(char, 0)
+                if output[next_state] is None:
+                    output[next_state] = output[fail[next_state]]
+        return tuple(goto), tuple(fail), tuple(output)
+
+    def find(self, automaton, text):
+        goto, fail, output = automaton
+        state = 0
+        for char in text.lower():
+            while state and char not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(char, 0)
+            if output[state] is not None:
+                return output[state]
+        return None
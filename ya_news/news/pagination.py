@@ -0,0 +1,62 @@
+from datetime import datetime
+
+from django.conf import settings
+from django.core.paginator import Paginator
+from django.db.models import Q
+from django.http import Http404
+
+from .models import Comment
+
+CURSOR_SEPARATOR = '_'
+
+
+class KnownCountPaginator(Paginator):
+    """Пагинатор с заранее известным числом объектов, без SELECT COUNT."""
+
+    def __init__(self, *args, count, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.count = count
+
+
+def make_cursor(comment):
+    """Курсор указывает на последний показанный комментарий."""
+    return f'{comment.created.isoformat()}{CURSOR_SEPARATOR}{comment.pk}'
+
+
+def parse_cursor(cursor):
+    """Разбирает курсор на пару (created, id)."""
+    try:
+        created, pk = cursor.rsplit(CURSOR_SEPARATOR, 1)
+        return datetime.fromisoformat(created), int(pk)
+    except ValueError:
+        raise Http404('Некорректный курсор.')
+
+
+def get_comments_queryset(news_id, cursor=None):
+    """Комментарии новости, идущие после курсора, в порядке (created, id)."""
+    queryset = Comment.objects.filter(news_id=news_id).select_related(
+        'author'
+    ).order_by('created', 'pk')
+    if cursor:
+        created, pk = parse_cursor(cursor)
+        queryset = queryset.filter(
+            Q(created__gt=created) | Q(created=created, pk__gt=pk)
+        )
+    return queryset
+
+
+def get_comments_page(news_id, cursor=None):
+    """
+    Возвращает страницу комментариев новости и курсор следующей страницы.
+
+    Пагинация идёт по ключу (created, id), поэтому стоимость запроса
+    не зависит от номера страницы, в отличие от OFFSET.
+    """
+    per_page = settings.COMMENTS_COUNT_ON_DETAIL_PAGE
+    queryset = get_comments_queryset(news_id, cursor)
+    comments = list(queryset[:per_page + 1])
+    next_cursor = None
+    if len(comments) > per_page:
+        comments = comments[:per_page]
+        next_cursor = make_cursor(comments[-1])
+    return comments, next_cursor
@@ -0,0 +1,169 @@
+"""
+Профилирование запросов: число и время SQL, рендеринг шаблонов, итог.
+
+Включается настройкой REQUEST_PROFILING; без неё middleware отключается
+при старте и ничего не стоит. Профилируется доля запросов
+REQUEST_PROFILING_SAMPLE_RATE: такие ответы получают заголовок
+Server-Timing, а замеры копятся в скользящем окне по имени адреса.
+Каждые REQUEST_PROFILING_FLUSH_EVERY замеров перцентили окна
+записываются в RequestTiming и видны в админке. Окна у каждого
+процесса свои, в таблице остаются перцентили последнего записавшего.
+
+SQL считается обёрткой, которая стоит на всех соединениях всех потоков,
+а профиль запроса она находит через contextvars. Контекст копируется
+и в потоки sync_to_async, поэтому учитываются и запросы к базе,
+сделанные не в потоке middleware.
+"""
+import contextvars
+import random
+import statistics
+import threading
+import time
+from collections import defaultdict, deque
+
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import connections
+from django.db.backends.signals import connection_created
+
+from .models import RequestTiming
+
+METRICS = tuple(metric for metric, _ in RequestTiming.METRICS)
+
+current_profile = contextvars.ContextVar('current_profile', default=None)
+
+
+class Profile:
+    """Замеры одного запроса."""
+
+    def __init__(self):
+        self.queries = 0
+        self.sql_ms = 0.0
+        self.render_ms = 0.0
+        self.total_ms = 0.0
+
+    def __call__(self, execute, sql, params, many, context):
+        # Вызывается из profile_queries: считает каждый запрос.
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.queries += 1
+            self.sql_ms += (time.perf_counter() - started) * 1e3
+
+    def server_timing(self):
+        return (
+            f'sql;dur={self.sql_ms:.2f};desc="{self.queries} queries", '
+            f'render;dur={self.render_ms:.2f}, '
+            f'total;dur={self.total_ms:.2f}'
+        )
+
+
+def profile_queries(execute, sql, params, many, context):
+    """Передаёт запрос профилю текущего запроса, если он профилируется."""
+    profile = current_profile.get()
+    if profile is None:
+        return execute(sql, params, many, context)
+    return profile(execute, sql, params, many, context)
+
+
+def install_profile_queries(connection, **kwargs):
+    if profile_queries not in connection.execute_wrappers:
+        connection.execute_wrappers.append(profile_queries)
+
+
+def percentiles(values):
+    """p50, p95 и p99 значений."""
+    if len(values) == 1:
+        return values[0], values[0], values[0]
+    quantiles = statistics.quantiles(values, n=100, method='inclusive')
+    return quantiles[49], quantiles[94], quantiles[98]
+
+
+class TimingWindows:
+    """Последние замеры каждого адреса и их запись в RequestTiming."""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.windows = defaultdict(self.new_window)
+        self.pending = defaultdict(int)
+
+    @staticmethod
+    def new_window():
+        return {
+            metric: deque(maxlen=settings.REQUEST_PROFILING_WINDOW)
+            for metric in METRICS
+        }
+
+    def add(self, url_name, profile):
+        with self.lock:
+            window = self.windows[url_name]
+            for metric in METRICS:
+                window[metric].append(getattr(profile, metric))
+            self.pending[url_name] += 1
+            if self.pending[url_name] < settings.REQUEST_PROFILING_FLUSH_EVERY:
+                return
+            self.pending[url_name] = 0
+            values = {metric: list(window[metric]) for metric in METRICS}
+        for metric, metric_values in values.items():
+            p50, p95, p99 = percentiles(metric_values)
+            RequestTiming.objects.update_or_create(
+                url_name=url_name, metric=metric, defaults={
+                    'samples': len(metric_values),
+                    'p50': p50, 'p95': p95, 'p99': p99,
+                },
+            )
+
+    def clear(self):
+        with self.lock:
+            self.windows.clear()
+            self.pending.clear()
+
+
+timing_windows = TimingWindows()
+
+
+class ProfilingMiddleware:
+    """
+    Замеряет запрос и отдаёт замеры в заголовке Server-Timing.
+
+    Ставится первой в MIDDLEWARE, чтобы итог включал остальные
+    middleware, а рендеринг шаблона шёл уже после их
+    process_template_response.
+    """
+
+    def __init__(self, get_response):
+        if not settings.REQUEST_PROFILING:
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        # Соединения, которые откроются потом, в том числе в других потоках.
+        connection_created.connect(
+            install_profile_queries, dispatch_uid=__name__
+        )
+
+    def __call__(self, request):
+        if random.random() >= settings.REQUEST_PROFILING_SAMPLE_RATE:
+            return self.get_response(request)
+        profile = request.profile = Profile()
+        # Соединения текущего потока могли открыться до подключения сигнала.
+        for connection in connections.all():
+            install_profile_queries(connection)
+        started = time.perf_counter()
+        token = current_profile.set(profile)
+        try:
+            response = self.get_response(request)
+        finally:
+            current_profile.reset(token)
+        profile.total_ms = (time.perf_counter() - started) * 1e3
+        response['Server-Timing'] = profile.server_timing()
+        if request.resolver_match is not None:
+            timing_windows.add(request.resolver_match.view_name, profile)
+        return response
+
+    def process_template_response(self, request, response):
+        profile = getattr(request, 'profile', None)
+        if profile is not None:
+            started = time.perf_counter()
+            response.render()
+            profile.render_ms = (time.perf_counter() - started) * 1e3
+        return response
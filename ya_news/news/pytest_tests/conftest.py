@@ -1,21 +1,90 @@
+import copy
 from datetime import datetime, timedelta
 
 import pytest
 from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
 from django.test.client import Client
 from django.urls import reverse
 
 from news.models import Comment, News
 
+User = get_user_model()
+
+
+@pytest.fixture(autouse=True)
+def clear_cache():
+    cache.clear()
+
+
+def login(user):
+    client = Client()
+    client.force_login(user)
+    return client.cookies[settings.SESSION_COOKIE_NAME].value
+
+
+@pytest.fixture(scope='session', autouse=True)
+def dataset(django_db_setup, django_db_blocker):
+    """
+    Общие данные всех тестов, создаются один раз за сессию
+    до первого теста, чтобы все тесты видели одну и ту же базу.
+
+    Каждый тест выполняется в транзакции, которая откатывается,
+    поэтому видит эти данные нетронутыми. Транзакционные тесты
+    очищают базу после себя, и данные им недоступны.
+    """
+    with django_db_blocker.unblock():
+        author = User.objects.create(username='Автор')
+        reader = User.objects.create(username='Читатель')
+        news = News.objects.create(title='Заголовок', text='Текст')
+        comment = Comment.objects.create(
+            news=news, author=author, text='Текст комментария',
+        )
+        comments = [
+            Comment.objects.create(
+                news=news, author=author, text=f'Текст {index}',
+            )
+            for index in range(10)
+        ]
+        # Счётчик комментариев новости обновили сигналы.
+        news.refresh_from_db()
+        return {
+            'author': author,
+            'reader': reader,
+            'author_session': login(author),
+            'reader_session': login(reader),
+            'news': news,
+            'all_news': News.objects.bulk_create(
+                News(title=f'Новость {index}', text='Просто текст.',
+                     date=datetime.today() - timedelta(days=index))
+                for index in range(settings.NEWS_COUNT_ON_HOME_PAGE + 1)
+            ),
+            'comment': comment,
+            'comments': comments,
+        }
+
+
+@pytest.fixture
+def seeded(db, dataset):
+    """Копия общих данных: изменения объектов в тесте не видны другим."""
+    return copy.deepcopy(dataset)
+
+
+def session_client(session_key):
+    client = Client()
+    client.cookies[settings.SESSION_COOKIE_NAME] = session_key
+    return client
+
 
 @pytest.fixture
-def author(django_user_model):
-    return django_user_model.objects.create(username='Автор')
+def author(seeded):
+    return seeded['author']
 
 
 @pytest.fixture
-def reader(django_user_model):
-    return django_user_model.objects.create(username='Читатель')
+def reader(seeded):
+    return seeded['reader']
 
 
 @pytest.fixture
@@ -24,35 +93,33 @@ def anonymous_client():
 
 
 @pytest.fixture
-def author_client(author):
-    client = Client()
-    client.force_login(author)
-    return client
+def author_session(seeded, author):
+    return seeded['author_session']
 
 
 @pytest.fixture
-def reader_client(reader):
-    client = Client()
-    client.force_login(reader)
-    return client
+def reader_session(seeded, reader):
+    return seeded['reader_session']
 
 
 @pytest.fixture
-def news():
-    news = News.objects.create(
-        title='Заголовок',
-        text='Текст',
-    )
-    return news
+def author_client(author_session):
+    return session_client(author_session)
 
 
 @pytest.fixture
-def all_news():
-    return News.objects.bulk_create(
-        News(title=f'Новость {index}', text='Просто текст.',
-             date=datetime.today() - timedelta(days=index))for index in range(
-                 settings.NEWS_COUNT_ON_HOME_PAGE + 1
-        ))
+def reader_client(reader_session):
+    return session_client(reader_session)
+
+
+@pytest.fixture
+def news(seeded):
+    return seeded['news']
+
+
+@pytest.fixture
+def all_news(seeded):
+    return seeded['all_news']
 
 
 @pytest.fixture
@@ -63,21 +130,13 @@ def form_data():
 
 
 @pytest.fixture
-def comment(author, news):
-    comment = Comment.objects.create(
-        news=news,
-        author=author,
-        text='Текст комментария',
-    )
-    return comment
+def comment(seeded, author, news):
+    return seeded['comment']
 
 
 @pytest.fixture
-def comments(author, news):
-    for index in range(10):
-        Comment.objects.create(
-            news=news, author=author, text=f'Текст {index}',
-        )
+def comments(seeded, author, news):
+    return seeded['comments']
 
 
 @pytest.fixture
@@ -90,6 +149,28 @@ def detail_url(news):
     return reverse('news:detail', args=(news.id,))
 
 
+@pytest.fixture
+def comments_url(news):
+    return reverse('news:comments', args=(news.id,))
+
+
+@pytest.fixture
+def search_url():
+    return reverse('news:search')
+
+
+@pytest.fixture
+def archive_url():
+    return reverse('news:archive')
+
+
+@pytest.fixture
+def archive_month_url(news):
+    return reverse(
+        'news:archive_month', args=(news.date.year, news.date.month)
+    )
+
+
 @pytest.fixture
 def delete_url(comment):
     return reverse('news:delete', args=(comment.id,))
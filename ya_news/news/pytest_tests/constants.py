@@ -2,6 +2,10 @@ import pytest
 
 HOME_URL = pytest.lazy_fixture('home_url')
 DETAIL_URL = pytest.lazy_fixture('detail_url')
+COMMENTS_URL = pytest.lazy_fixture('comments_url')
+SEARCH_URL = pytest.lazy_fixture('search_url')
+ARCHIVE_URL = pytest.lazy_fixture('archive_url')
+ARCHIVE_MONTH_URL = pytest.lazy_fixture('archive_month_url')
 DELETE_URL = pytest.lazy_fixture('delete_url')
 EDIT_URL = pytest.lazy_fixture('edit_url')
 LOGIN_URL = pytest.lazy_fixture('login_url')
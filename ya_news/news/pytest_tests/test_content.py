@@ -1,11 +1,33 @@
+import logging
+import re
+from datetime import date
+from html import unescape
+from http import HTTPStatus
+
 import pytest
+from asgiref.sync import async_to_sync, sync_to_async
 from django.conf import settings
+from django.http import HttpResponse
+from django.test import AsyncClient, Client, RequestFactory
+from django.urls import reverse
+from django.utils import timezone
 
+from news.cache import stats as cache_stats
 from news.forms import CommentForm
+from news.models import Comment, News, RequestTiming
+from news.profiling import METRICS, ProfilingMiddleware, timing_windows
+from yanews.templating import TimedDjangoTemplates, template_stats
 
 
 pytestmark = pytest.mark.django_db
 
+LOAD_MORE_RE = re.compile(r'href="([^"]+)" data-load-more')
+SEARCH_MORE_RE = re.compile(r'<a href="(\?q=[^"]+)">')
+SERVER_TIMING_RE = re.compile(
+    r'sql;dur=[\d.]+;desc="(\d+) queries", render;dur=([\d.]+), '
+    r'total;dur=[\d.]+'
+)
+
 
 def test_anonymous_client_has_no_form(client, detail_url):
     """Тест недоступности анонимному пользователю формы для отправки"""
@@ -46,3 +68,305 @@ def test_comments_order(client, detail_url, news, comments):
     all_timestamps = [comment.created for comment in all_comments]
     sorted_timestamps = sorted(all_timestamps)
     assert all_timestamps == sorted_timestamps
+
+
+def test_home_page_comment_count(client, home_url, news, comments,
+                                 django_assert_num_queries):
+    """Тест подсчёта комментариев на главной без загрузки комментариев."""
+    with django_assert_num_queries(1):
+        response = client.get(home_url)
+    assert f'Комментариев: {news.comment_set.count()}' in (
+        response.content.decode()
+    )
+    with django_assert_num_queries(1):
+        client.get(home_url)
+
+
+def test_home_page_cache_invalidation(client, home_url, all_news, author,
+                                      django_assert_num_queries):
+    """Тест сброса кеша только у новости с новым комментарием."""
+    client.get(home_url)
+    news = News.objects.first()
+    Comment.objects.create(news=news, author=author, text='Текст')
+    card_hits = cache_stats['card_hits']
+    card_misses = cache_stats['card_misses']
+    with django_assert_num_queries(1):
+        response = client.get(home_url)
+    assert 'Комментариев: 1' in response.content.decode()
+    assert cache_stats['card_misses'] == card_misses + 1
+    assert cache_stats['card_hits'] == (
+        card_hits + settings.NEWS_COUNT_ON_HOME_PAGE - 1
+    )
+
+
+def test_home_page_not_modified(client, reader_client, home_url, all_news,
+                                author, django_assert_num_queries):
+    """Тест ответа 304 на главной с одним запросом и без рендеринга."""
+    etag = client.get(home_url)['ETag']
+    with django_assert_num_queries(1):
+        response = client.get(home_url, HTTP_IF_NONE_MATCH=etag)
+    assert response.status_code == HTTPStatus.NOT_MODIFIED
+    assert not response.templates
+    response = reader_client.get(home_url, HTTP_IF_NONE_MATCH=etag)
+    assert response.status_code == HTTPStatus.OK
+    assert 'ETag' not in response
+    Comment.objects.create(
+        news=News.objects.first(), author=author, text='Текст'
+    )
+    response = client.get(home_url, HTTP_IF_NONE_MATCH=etag)
+    assert response.status_code == HTTPStatus.OK
+
+
+def test_home_page_follows_data(client, home_url, all_news):
+    """Тест главной после изменения, о котором кеш процесса не знает."""
+    etag = client.get(home_url)['ETag']
+    news = News.objects.first()
+    # UPDATE без сигналов: так изменение видит другой процесс.
+    News.objects.filter(pk=news.pk).update(
+        title='Новый заголовок', updated_at=timezone.now()
+    )
+    response = client.get(home_url, HTTP_IF_NONE_MATCH=etag)
+    assert response.status_code == HTTPStatus.OK
+    assert 'Новый заголовок' in response.content.decode()
+
+
+def test_detail_page_not_modified(client, author_client, detail_url, comment,
+                                  edit_url, django_assert_num_queries):
+    """Тест ответа 304 на странице новости только для анонимов."""
+    response = client.get(detail_url)
+    last_modified = response['Last-Modified']
+    with django_assert_num_queries(1):
+        response = client.get(
+            detail_url, HTTP_IF_MODIFIED_SINCE=last_modified
+        )
+    assert response.status_code == HTTPStatus.NOT_MODIFIED
+    assert not response.templates
+    etag = client.get(detail_url)['ETag']
+    # Страница пользователя содержит CSRF-токен, который меняется при входе.
+    response = author_client.get(detail_url, HTTP_IF_NONE_MATCH=etag)
+    assert response.status_code == HTTPStatus.OK
+    assert 'ETag' not in response
+    assert 'Last-Modified' not in response
+    author_client.post(edit_url, data={'text': 'Новый текст'})
+    response = client.get(detail_url, HTTP_IF_NONE_MATCH=etag)
+    assert response.status_code == HTTPStatus.OK
+
+
+def test_comments_keyset_pagination(client, settings, detail_url, news,
+                                    comments, django_assert_num_queries):
+    """Тест постраничной загрузки комментариев по курсору."""
+    settings.COMMENTS_COUNT_ON_DETAIL_PAGE = 3
+    content = client.get(detail_url).content.decode()
+    pages = [content]
+    next_page = LOAD_MORE_RE.search(content)
+    while next_page:
+        with django_assert_num_queries(2):
+            content = client.get(unescape(next_page.group(1))).content
+        content = content.decode()
+        pages.append(content)
+        next_page = LOAD_MORE_RE.search(content)
+    assert len(pages) == 4
+    all_content = ''.join(pages)
+    positions = [
+        all_content.index(f'<p class="mb-0">{comment.text}</p>')
+        for comment in news.comment_set.order_by('created', 'pk')
+    ]
+    assert positions == sorted(positions)
+
+
+def test_comments_fragment_cache(author_client, reader_client, detail_url,
+                                 comment, edit_url, delete_url,
+                                 django_assert_max_num_queries):
+    """Тест кеширования комментариев и ссылок управления для автора."""
+    reader_client.get(detail_url)
+    with django_assert_max_num_queries(3):
+        content = author_client.get(detail_url).content.decode()
+    assert edit_url in content
+    assert delete_url in content
+    content = reader_client.get(detail_url).content.decode()
+    assert comment.text in content
+    assert edit_url not in content
+    comment.text = 'Обновлённый текст'
+    comment.save()
+    content = reader_client.get(detail_url).content.decode()
+    assert comment.text in content
+
+
+def test_comments_fragment_follows_data(client, detail_url, news, comment):
+    """Тест комментариев после изменения, о котором кеш процесса не знает."""
+    client.get(detail_url)
+    # UPDATE без сигналов: так изменение видит другой процесс.
+    Comment.objects.filter(pk=comment.pk).update(text='Новый текст')
+    News.objects.filter(pk=news.pk).update(updated_at=timezone.now())
+    content = client.get(detail_url).content.decode()
+    assert 'Новый текст' in content
+
+
+def test_home_page_file_based_cache(client, settings, tmp_path, home_url,
+                                    all_news, django_assert_num_queries):
+    """Тест кеша главной страницы с файловым бэкендом."""
+    settings.CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+            'LOCATION': tmp_path,
+        }
+    }
+    first_response = client.get(home_url)
+    with django_assert_num_queries(1):
+        response = client.get(home_url)
+    assert response.content == first_response.content
+    assert any(tmp_path.iterdir())
+
+
+def test_search_highlight_and_pagination(client, settings, search_url,
+                                         author):
+    """Тест подсветки и постраничной выдачи поиска по новостям."""
+    settings.NEWS_COUNT_ON_SEARCH_PAGE = 2
+    all_news = [
+        News.objects.create(
+            title=f'Выборы {index}', text='Итоги <b>выборов</b> подведены.'
+        )
+        for index in range(5)
+    ]
+    content = client.get(search_url, {'q': 'итоги'}).content.decode()
+    assert '<mark>Итоги</mark> &lt;b&gt;выборов&lt;/b&gt;' in content
+    pages = [content]
+    next_page = SEARCH_MORE_RE.search(content)
+    while next_page:
+        content = client.get(
+            search_url + unescape(next_page.group(1))
+        ).content.decode()
+        pages.append(content)
+        next_page = SEARCH_MORE_RE.search(content)
+    assert len(pages) == 3
+    all_content = ''.join(pages)
+    positions = [
+        all_content.index(f'>Выборы {index}</a>')
+        for index in range(len(all_news))
+    ]
+    assert positions == sorted(positions, reverse=True)
+    Comment.objects.create(
+        news=all_news[0], author=author, text='Явка была высокой'
+    )
+    response = client.get(search_url, {'q': 'явка', 'in': 'comments'})
+    assert '<mark>Явка</mark> была высокой' in response.content.decode()
+
+
+def test_archive_month_pagination(client, settings,
+                                  django_assert_num_queries):
+    """Тест страниц архива за месяц без подсчёта новостей в базе."""
+    settings.NEWS_COUNT_ON_ARCHIVE_PAGE = 2
+    for day in (1, 15, 30):
+        News.objects.create(
+            title=f'Новость {day}', text='Текст', date=date(2022, 9, day)
+        )
+    News.objects.create(title='Октябрь', text='Текст', date=date(2022, 10, 1))
+    url = reverse('news:archive_month', args=(2022, 9))
+    # Счётчик месяца и страница новостей.
+    with django_assert_num_queries(2):
+        response = client.get(url)
+    assert [news.date.day for news in response.context['object_list']] == [
+        30, 15
+    ]
+    assert response.context['paginator'].num_pages == 2
+    response = client.get(url, {'page': 2})
+    assert [news.title for news in response.context['object_list']] == [
+        'Новость 1'
+    ]
+    response = client.get(reverse('news:archive_year', args=(2022,)))
+    assert [
+        (bucket.month.month, bucket.count)
+        for bucket in response.context['object_list']
+    ] == [(10, 1), (9, 3)]
+
+
+def test_timed_templates_warm_up(settings):
+    """Тест прогрева шаблонов и замера времени их рендеринга."""
+    backend = TimedDjangoTemplates({
+        'NAME': 'timed',
+        'DIRS': [settings.BASE_DIR / 'templates'],
+        'APP_DIRS': False,
+        'OPTIONS': {
+            'loaders': [('django.template.loaders.cached.Loader', [
+                'django.template.loaders.filesystem.Loader',
+            ])],
+            'warm_up': True,
+        },
+    })
+    cache = backend.engine.template_loaders[0].get_template_cache
+    assert {'base.html', 'includes/header.html', 'news/home.html'} <= set(
+        cache
+    )
+    renders = template_stats['includes/errors.html'][0]
+    backend.get_template('includes/errors.html').render({})
+    assert template_stats['includes/errors.html'][0] == renders + 1
+
+
+def test_template_stats_summary(settings, caplog):
+    """Тест сводки по шаблонам в журнале вместо строки на рендеринг."""
+    settings.TEMPLATE_STATS_LOG_EVERY = 2
+    template = TimedDjangoTemplates({
+        'NAME': 'timed',
+        'DIRS': [settings.BASE_DIR / 'templates'],
+        'APP_DIRS': False,
+        'OPTIONS': {},
+    }).get_template('includes/errors.html')
+    with caplog.at_level(logging.INFO, logger='yanews.templating'):
+        for _ in range(2):
+            template.render({})
+    assert caplog.records
+    assert all(record.levelno == logging.INFO for record in caplog.records)
+    assert any(
+        'Шаблон includes/errors.html: рендерингов' in record.getMessage()
+        for record in caplog.records
+    )
+
+
+def test_profiling_middleware(client, admin_client, settings, detail_url,
+                              comments):
+    """Тест заголовка Server-Timing и перцентилей времени по адресам."""
+    settings.REQUEST_PROFILING = True
+    settings.REQUEST_PROFILING_FLUSH_EVERY = 2
+    timing_windows.clear()
+    response = client.get(detail_url)
+    queries, render_ms = SERVER_TIMING_RE.fullmatch(
+        response['Server-Timing']
+    ).groups()
+    assert int(queries) > 0
+    assert float(render_ms) > 0
+    assert not RequestTiming.objects.exists()
+    client.get(detail_url)
+    assert sorted(RequestTiming.objects.filter(
+        url_name='news:detail', samples=2
+    ).values_list('metric', flat=True)) == sorted(METRICS)
+    response = admin_client.get(
+        reverse('admin:news_requesttiming_changelist')
+    )
+    assert 'news:detail' in response.content.decode()
+    settings.REQUEST_PROFILING = False
+    assert 'Server-Timing' not in Client().get(detail_url)
+
+
+@pytest.mark.django_db(transaction=True)
+def test_profiling_queries_in_other_threads(settings):
+    """Тест учёта запросов под ASGI и из пула потоков."""
+    settings.REQUEST_PROFILING = True
+    # Транзакционный тест не видит общих данных сессии.
+    news = News.objects.create(title='Заголовок', text='Текст')
+    detail_url = reverse('news:detail', args=(news.pk,))
+
+    async def get_detail():
+        return await AsyncClient().get(detail_url)
+
+    response = async_to_sync(get_detail)()
+    queries, _ = SERVER_TIMING_RE.fullmatch(
+        response['Server-Timing']
+    ).groups()
+    assert int(queries) > 0
+    count_in_pool = sync_to_async(
+        News.objects.count, thread_sensitive=False
+    )
+    response = ProfilingMiddleware(
+        lambda request: HttpResponse(async_to_sync(count_in_pool)())
+    )(RequestFactory().get(detail_url))
+    assert 'desc="1 queries"' in response['Server-Timing']
@@ -0,0 +1,62 @@
+import pytest
+from django.conf import settings
+from django.db import connection
+
+from news.pagination import get_comments_queryset, make_cursor
+from news.views import CommentUpdate, NewsList, NewsMonthArchive
+
+
+pytestmark = [
+    pytest.mark.django_db,
+    pytest.mark.skipif(
+        connection.vendor != 'sqlite', reason='План запроса SQLite.'
+    ),
+]
+
+
+def get_plan(queryset):
+    """Строки плана EXPLAIN QUERY PLAN без служебных номеров узлов."""
+    return [
+        line.split(' ', 3)[-1] for line in queryset.explain().splitlines()
+    ]
+
+
+def assert_no_full_scan(queryset, ordered=False):
+    plan = get_plan(queryset)
+    for detail in plan:
+        assert not (detail.startswith('SCAN') and 'USING' not in detail), (
+            plan
+        )
+        if ordered:
+            assert 'TEMP B-TREE' not in detail, plan
+
+
+def test_home_page_uses_index(rf):
+    """Тест выборки новостей для главной страницы по индексу."""
+    view = NewsList()
+    view.request = rf.get('/')
+    queryset = view.get_queryset()
+    assert_no_full_scan(queryset, ordered=True)
+
+
+def test_comments_page_uses_index(news, comment):
+    """Тест выборки страниц комментариев новости по индексу."""
+    per_page = settings.COMMENTS_COUNT_ON_DETAIL_PAGE
+    for cursor in (None, make_cursor(comment)):
+        queryset = get_comments_queryset(news.pk, cursor)[:per_page]
+        assert_no_full_scan(queryset, ordered=True)
+
+
+def test_author_comments_use_index(rf, author, comment):
+    """Тест выборки комментариев пользователя по индексу."""
+    view = CommentUpdate()
+    view.request = rf.get('/')
+    view.request.user = author
+    assert_no_full_scan(view.get_queryset().filter(pk=comment.pk))
+    assert_no_full_scan(view.get_queryset())
+
+
+def test_archive_month_uses_index():
+    """Тест выборки новостей за месяц по индексу."""
+    view = NewsMonthArchive(kwargs={'year': 2022, 'month': 9})
+    assert_no_full_scan(view.get_queryset()[:20], ordered=True)
@@ -1,10 +1,24 @@
+import csv
+import json
+from datetime import date, datetime, timezone
 from http import HTTPStatus
+from io import StringIO
 
 import pytest
+from django.conf import settings
+from django.core.management import call_command
 from pytest_django.asserts import assertFormError, assertRedirects
 
-from news.forms import BAD_WORDS, WARNING
-from news.models import Comment
+from news.management.commands.load_news import iter_json_array
+from news.forms import BAD_WORDS, WARNING, CommentForm, check_bad_words
+from news.models import BadWord, Comment, News, NewsMonth
+from news.moderation import (
+    AhoCorasickBadWordsMatcher,
+    RegexBadWordsMatcher,
+    SubstringBadWordsMatcher,
+)
+from news.search import search_comments, search_news
+from .constants import DELETE_URL, DETAIL_URL, EDIT_URL
 
 
 pytestmark = pytest.mark.django_db
@@ -81,3 +95,228 @@ def test_user_cant_edit_comment_of_another_user(comment, reader_client,
     assert comment.text == comment_from_db.text
     assert comment.news == comment_from_db.news
     assert comment.author == comment_from_db.author
+
+
+def test_comment_count_follows_comments(author_client, author, news,
+                                        detail_url, form_data, comment,
+                                        delete_url):
+    """Тест поддержания счётчика комментариев новости."""
+    initial_count = news.comment_set.count()
+    news.refresh_from_db()
+    assert news.comment_count == initial_count
+    author_client.post(detail_url, data=form_data)
+    news.refresh_from_db()
+    assert news.comment_count == initial_count + 1
+    author_client.delete(delete_url)
+    news.refresh_from_db()
+    assert news.comment_count == initial_count
+    author.delete()
+    news.refresh_from_db()
+    assert news.comment_count == 0
+
+
+@pytest.mark.parametrize(
+    'url, data',
+    (
+        (DETAIL_URL, {'text': 'Новый текст'}),
+        (EDIT_URL, {'text': 'Новый текст'}),
+        (DELETE_URL, {}),
+    ),
+)
+def test_comment_write_queries(author_client, url, data,
+                               django_assert_num_queries):
+    """Тест числа запросов при записи комментариев."""
+    # Словарь запрещённых слов загружается из базы при первой проверке.
+    check_bad_words('')
+    # Сессия, пользователь, новость или комментарий, запись в базу
+    # и обновление новости сигналом.
+    with django_assert_num_queries(5):
+        response = author_client.post(url, data=data)
+    assert response.status_code == HTTPStatus.FOUND
+
+
+def get_month_counts(year=None):
+    months = NewsMonth.objects.filter(count__gt=0)
+    if year is not None:
+        months = months.filter(month__year=year)
+    return {
+        (bucket.month.year, bucket.month.month): bucket.count
+        for bucket in months
+    }
+
+
+def test_news_months_follow_news():
+    """Тест поддержания счётчиков новостей по месяцам."""
+    news, other = [
+        News.objects.create(
+            title='Новость', text='Текст', date=date(2022, 10, day)
+        )
+        for day in (31, 1)
+    ]
+    assert get_month_counts(2022) == {(2022, 10): 2}
+    news = News.objects.only('title').get(pk=news.pk)
+    news.title = 'Заголовок'
+    news.save()
+    assert get_month_counts(2022) == {(2022, 10): 2}
+    news.date = date(2022, 11, 1)
+    news.save()
+    assert get_month_counts(2022) == {(2022, 10): 1, (2022, 11): 1}
+    news.delete()
+    assert get_month_counts(2022) == {(2022, 10): 1}
+    News.objects.only('title').get(pk=other.pk).delete()
+    assert get_month_counts(2022) == {}
+
+
+def test_recount_comments_command(news, comments):
+    """Тест пересчёта счётчиков комментариев командой."""
+    News.objects.update(comment_count=0)
+    call_command('recount_comments', batch_size=1, stdout=StringIO())
+    news.refresh_from_db()
+    assert news.comment_count == Comment.objects.filter(news=news).count()
+
+
+@pytest.mark.parametrize('matcher_class', (
+    AhoCorasickBadWordsMatcher,
+    RegexBadWordsMatcher,
+    SubstringBadWordsMatcher,
+))
+def test_bad_words_matchers(matcher_class):
+    """Тест одинакового поведения всех матчеров запрещённых слов."""
+    matcher = matcher_class(BAD_WORDS + ('негодяйка', 'дис'))
+    assert matcher.search('Просто текст') is None
+    for word in BAD_WORDS:
+        assert matcher.search(f'Ну и {word.upper()}!')
+    assert matcher.search('редис') == 'дис'
+    state = matcher.state
+    matcher.update(())
+    assert matcher.search(BAD_WORDS[0]) is None
+    # Перестройка не трогает словарь, который уже читают другие потоки.
+    assert matcher.find(state[1], BAD_WORDS[0]) is not None
+
+
+@pytest.mark.parametrize('matcher_path', (
+    'news.moderation.RegexBadWordsMatcher',
+    'news.moderation.SubstringBadWordsMatcher',
+))
+def test_bad_words_matcher_setting(settings, author_client, detail_url,
+                                   matcher_path):
+    """Тест выбора матчера запрещённых слов через настройки."""
+    settings.BAD_WORDS_MATCHER = matcher_path
+    initial_comments_count = Comment.objects.count()
+    response = author_client.post(detail_url, data={'text': BAD_WORDS[1]})
+    assertFormError(response, 'form', 'text', errors=WARNING)
+    assert Comment.objects.count() == initial_comments_count
+
+
+def test_bad_words_from_database(django_assert_num_queries):
+    """Тест применения словаря из базы без запросов в обычном режиме."""
+    form_data = {'text': 'Вот же злодей'}
+    assert CommentForm(data=form_data).is_valid()
+    with django_assert_num_queries(0):
+        assert CommentForm(data=form_data).is_valid()
+    BadWord.objects.create(word='злодей')
+    assert not CommentForm(data=form_data).is_valid()
+    BadWord.objects.filter(word='злодей').delete()
+    assert CommentForm(data=form_data).is_valid()
+
+
+def test_bad_words_ttl(settings, django_assert_num_queries):
+    """Тест чтения словаря, изменённого в другом процессе, по сроку."""
+    form_data = {'text': 'Вот же злодей'}
+    assert CommentForm(data=form_data).is_valid()
+    # bulk_create не отправляет сигналы, как и правка в другом процессе.
+    BadWord.objects.bulk_create([BadWord(word='злодей')])
+    with django_assert_num_queries(0):
+        assert CommentForm(data=form_data).is_valid()
+    settings.BAD_WORDS_TTL = 0
+    assert not CommentForm(data=form_data).is_valid()
+
+
+@pytest.mark.parametrize('file_format', ('jsonl', 'csv'))
+def test_import_comments_command(tmp_path, author, news, file_format):
+    """Тест импорта комментариев с проверкой запрещённых слов."""
+    missing_pk = News.objects.latest('pk').pk + 1
+    rows = [
+        {'news': news.pk, 'author': author.pk, 'text': 'Первый'},
+        {'news': news.pk, 'author': author.pk, 'text': BAD_WORDS[0]},
+        {'news': missing_pk, 'author': author.pk, 'text': 'Нет новости'},
+        {'news': news.pk, 'author': author.pk, 'text': 'Второй'},
+        {'news': news.pk, 'author': author.pk, 'text': 'Старый',
+         'created': '2022-09-01T10:00:00+00:00'},
+        {'news': news.pk, 'author': author.pk, 'text': 'Без даты',
+         'created': 'вчера'},
+    ]
+    path = tmp_path / f'comments.{file_format}'
+    with path.open('w', encoding='utf-8', newline='') as file:
+        if file_format == 'jsonl':
+            file.writelines(json.dumps(row) + '\n' for row in rows)
+        else:
+            writer = csv.DictWriter(file, fieldnames=rows[-1])
+            writer.writeheader()
+            writer.writerows(rows)
+    rejects = tmp_path / 'rejects.jsonl'
+    last_pk = Comment.objects.latest('pk').pk
+    initial_count = news.comment_count
+    call_command(
+        'import_comments', path, batch_size=2, rejects=rejects,
+        stdout=StringIO(),
+    )
+    assert list(Comment.objects.filter(pk__gt=last_pk).values_list(
+        'text', flat=True
+    )) == ['Старый', 'Первый', 'Второй']
+    assert Comment.objects.get(text='Старый').created == datetime(
+        2022, 9, 1, 10, tzinfo=timezone.utc
+    )
+    news.refresh_from_db()
+    assert news.comment_count == initial_count + 3
+    assert len(rejects.read_text(encoding='utf-8').splitlines()) == 3
+
+
+def test_load_news_command():
+    """Тест потоковой загрузки фикстуры новостей."""
+    path = settings.BASE_DIR / 'news' / 'fixtures' / 'news.json'
+    with open(path, encoding='utf-8') as file:
+        expected = json.load(file)
+    with open(path, encoding='utf-8') as file:
+        assert list(iter_json_array(file, read_size=7)) == expected
+    last_pk = News.objects.latest('pk').pk
+    initial_months = sum(get_month_counts().values())
+    call_command(
+        'load_news', path, batch_size=4, defer_indexes=True,
+        stdout=StringIO(),
+    )
+    assert sorted(News.objects.filter(pk__gt=last_pk).values_list(
+        'title', flat=True
+    )) == sorted(obj['fields']['title'] for obj in expected)
+    assert sum(get_month_counts().values()) == initial_months + len(expected)
+    (loaded,), _ = search_news('Шредингера', None, 10)
+    news = News.objects.create(title='Кот Шредингера', text='Жив')
+    hits, _ = search_news('Шредингера', None, 10)
+    assert [hit.pk for hit in hits] == [news.pk, loaded.pk]
+
+
+def test_loaddata_news_fixture():
+    """Тест загрузки фикстуры новостей через loaddata."""
+    call_command('loaddata', 'news.json', verbosity=0)
+    assert News.objects.exists()
+    assert not News.objects.filter(updated_at__isnull=True).exists()
+
+
+def test_search_index_follows_changes(author_client, news, comment,
+                                      edit_url, delete_url):
+    """Тест обновления поисковых индексов при изменении и удалении."""
+    News.objects.filter(pk=news.pk).update(text='Сегодня прошёл дождь')
+    author_client.post(edit_url, data={'text': 'Где мой зонт?'})
+    for search, query, expected in (
+        (search_news, 'дождь', [news.pk]),
+        (search_comments, 'зонт', [comment.pk]),
+        (search_comments, 'комментария', []),
+    ):
+        hits, _ = search(query, None, 10)
+        assert [hit.pk for hit in hits] == expected, query
+    hits, _ = search_news('Текст', None, 10)
+    assert news.pk not in [hit.pk for hit in hits]
+    author_client.post(delete_url)
+    news.delete()
+    assert search_news('дождь', None, 10) == ([], None)
+    assert search_comments('зонт', None, 10) == ([], None)
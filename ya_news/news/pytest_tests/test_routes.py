@@ -1,11 +1,15 @@
 from http import HTTPStatus
 
 import pytest
+from django.urls import reverse
 from pytest_django.asserts import assertRedirects
 
 from .constants import (
     ANONYMOUS_CLIENT,
+    ARCHIVE_MONTH_URL,
+    ARCHIVE_URL,
     AUTHOR_CLIENT,
+    COMMENTS_URL,
     DELETE_URL,
     DETAIL_URL,
     EDIT_URL,
@@ -13,6 +17,7 @@ from .constants import (
     LOGIN_URL,
     LOGOUT_URL,
     READER_CLIENT,
+    SEARCH_URL,
     SIGNUP_URL,
 )
 
@@ -25,6 +30,10 @@ pytestmark = pytest.mark.django_db
     (
         (HOME_URL, ANONYMOUS_CLIENT, HTTPStatus.OK),
         (DETAIL_URL, ANONYMOUS_CLIENT, HTTPStatus.OK),
+        (COMMENTS_URL, ANONYMOUS_CLIENT, HTTPStatus.OK),
+        (SEARCH_URL, ANONYMOUS_CLIENT, HTTPStatus.OK),
+        (ARCHIVE_URL, ANONYMOUS_CLIENT, HTTPStatus.OK),
+        (ARCHIVE_MONTH_URL, ANONYMOUS_CLIENT, HTTPStatus.OK),
         (DELETE_URL, AUTHOR_CLIENT, HTTPStatus.OK),
         (EDIT_URL, AUTHOR_CLIENT, HTTPStatus.OK),
         (DELETE_URL, READER_CLIENT, HTTPStatus.NOT_FOUND),
@@ -52,3 +61,24 @@ def test_redirect_for_anonymous_client(redirect_url_prefix, redirect_url,
     expected_url = f'{redirect_url}?next={redirect_url_prefix}'
     response = anonymous_client.get(redirect_url_prefix)
     assertRedirects(response, expected_url)
+
+
+@pytest.mark.parametrize(
+    'name, args', (
+        ('news:archive_year', (0,)),
+        ('news:archive_year', (9999,)),
+        ('news:archive_month', (9999, 12)),
+        ('news:archive_month', (2022, 13)),
+    )
+)
+def test_archive_invalid_dates(client, name, args):
+    """Тест ответа 404 на несуществующие даты архива."""
+    response = client.get(reverse(name, args=args))
+    assert response.status_code == HTTPStatus.NOT_FOUND
+
+
+@pytest.mark.parametrize('name', ('news:detail', 'news:comments'))
+def test_missing_news_not_found(client, news, name):
+    """Тест ответа 404 на несуществующую новость."""
+    response = client.get(reverse(name, args=(news.pk + 1000,)))
+    assert response.status_code == HTTPStatus.NOT_FOUND
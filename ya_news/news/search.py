@@ -0,0 +1,212 @@
+import re
+from collections import namedtuple
+
+from django.db import connection
+from django.http import Http404
+from django.utils.html import escape
+from django.utils.safestring import mark_safe
+
+# Служебные символы, которыми FTS5 обрамляет найденные слова.
+# Разметку <mark> подставляем уже после экранирования текста.
+HIGHLIGHT_START = '\x02'
+HIGHLIGHT_END = '\x03'
+SNIPPET_ELLIPSIS = '…'
+SNIPPET_TOKENS = 24
+WORD_RE = re.compile(r'\w+')
+
+NewsHit = namedtuple('NewsHit', 'pk title snippet')
+CommentHit = namedtuple('CommentHit', 'pk news_id news_title snippet')
+
+
+class FtsIndex:
+    """
+    Таблица FTS5 с внешним содержимым.
+
+    Тексты хранятся только в таблице модели, а триггеры обновляют
+    индекс при любой записи, включая bulk_create и удаление каскадом.
+    Столбцы из unindexed можно читать, но поиск по ним не идёт.
+    """
+
+    def __init__(self, table, content, columns, unindexed=()):
+        self.table = table
+        self.content = content
+        self.columns = columns
+        self.unindexed = unindexed
+
+    def create_sql(self):
+        columns = ', '.join(
+            f'{column} UNINDEXED' if column in self.unindexed else column
+            for column in self.columns
+        )
+        return (
+            f'CREATE VIRTUAL TABLE IF NOT EXISTS {self.table} USING fts5('
+            f"{columns}, content='{self.content}', content_rowid='id', "
+            "tokenize='unicode61 remove_diacritics 2')"
+        )
+
+    def create_triggers_sql(self):
+        columns = ', '.join(self.columns)
+        new_values = ', '.join(f'new.{column}' for column in self.columns)
+        old_values = ', '.join(f'old.{column}' for column in self.columns)
+        insert = (
+            f'INSERT INTO {self.table}(rowid, {columns}) '
+            f'VALUES (new.id, {new_values});'
+        )
+        delete = (
+            f'INSERT INTO {self.table}({self.table}, rowid, {columns}) '
+            f"VALUES ('delete', old.id, {old_values});"
+        )
+        return (
+            f'CREATE TRIGGER IF NOT EXISTS {self.table}_insert '
+            f'AFTER INSERT ON {self.content} BEGIN {insert} END',
+            f'CREATE TRIGGER IF NOT EXISTS {self.table}_delete '
+            f'AFTER DELETE ON {self.content} BEGIN {delete} END',
+            f'CREATE TRIGGER IF NOT EXISTS {self.table}_update '
+            f'AFTER UPDATE OF {columns} ON {self.content} '
+            f'BEGIN {delete} {insert} END',
+        )
+
+    def drop_triggers_sql(self):
+        return tuple(
+            f'DROP TRIGGER IF EXISTS {self.table}_{action}'
+            for action in ('insert', 'delete', 'update')
+        )
+
+    def rebuild_sql(self):
+        return f"INSERT INTO {self.table}({self.table}) VALUES ('rebuild')"
+
+
+NEWS_INDEX = FtsIndex('news_news_fts', 'news_news', ('title', 'text'))
+COMMENT_INDEX = FtsIndex(
+    'news_comment_fts', 'news_comment', ('text', 'news_id'),
+    unindexed=('news_id',),
+)
+INDEXES = (NEWS_INDEX, COMMENT_INDEX)
+
+# Выдача идёт от новых записей к старым. FTS5 хранит списки документов
+# в порядке rowid, поэтому такой запрос с LIMIT останавливается на первых
+# совпадениях и не ранжирует их все, как ORDER BY rank.
+NEWS_SEARCH_SQL = (
+    'SELECT rowid, highlight(news_news_fts, 0, %s, %s), '
+    'snippet(news_news_fts, 1, %s, %s, %s, %s) '
+    'FROM news_news_fts WHERE news_news_fts MATCH %s {after} '
+    'ORDER BY rowid DESC LIMIT %s'
+)
+COMMENT_SEARCH_SQL = (
+    'SELECT news_comment_fts.rowid, news_comment_fts.news_id, '
+    'news_news.title, '
+    'snippet(news_comment_fts, 0, %s, %s, %s, %s) '
+    'FROM news_comment_fts '
+    'INNER JOIN news_news ON news_news.id = news_comment_fts.news_id '
+    'WHERE news_comment_fts MATCH %s {after} '
+    'ORDER BY news_comment_fts.rowid DESC LIMIT %s'
+)
+
+
+def is_supported(connection=connection):
+    return connection.vendor == 'sqlite'
+
+
+def install(cursor, rebuild=False, indexes=INDEXES):
+    """
+    Создаёт индексы и триггеры, если их нет.
+
+    Триггеры нужно переустанавливать после миграций, пересоздающих
+    таблицы новостей и комментариев: SQLite удаляет их вместе
+    со старой таблицей.
+    """
+    for index in indexes:
+        cursor.execute(index.create_sql())
+        for sql in index.create_triggers_sql():
+            cursor.execute(sql)
+        if rebuild:
+            cursor.execute(index.rebuild_sql())
+
+
+def uninstall(cursor, indexes=INDEXES):
+    for index in indexes:
+        for sql in index.drop_triggers_sql():
+            cursor.execute(sql)
+        cursor.execute(f'DROP TABLE IF EXISTS {index.table}')
+
+
+def build_match_query(query):
+    """
+    Превращает пользовательский ввод в запрос FTS5.
+
+    Все слова обязательны; спецсимволы синтаксиса FTS5 отбрасываются
+    вместе с остальной пунктуацией.
+    """
+    words = WORD_RE.findall(query)
+    if not words:
+        return None
+    return ' AND '.join(f'"{word}"' for word in words)
+
+
+def parse_after(after):
+    """Курсор выдачи: id последней показанной записи."""
+    if after is None:
+        return None
+    try:
+        return int(after)
+    except ValueError:
+        raise Http404('Некорректный курсор.')
+
+
+def render_highlight(text):
+    """Экранирует текст и отмечает найденные слова тегом <mark>."""
+    return mark_safe(
+        escape(text).replace(HIGHLIGHT_START, '<mark>').replace(
+            HIGHLIGHT_END, '</mark>'
+        )
+    )
+
+
+def run_search(index, sql, params, query, after, limit):
+    """
+    Выполняет поиск и возвращает страницу строк и курсор следующей.
+
+    Как и у комментариев, запрашивается на одну строку больше,
+    чтобы узнать, есть ли следующая страница.
+    """
+    match_query = build_match_query(query)
+    if match_query is None or not is_supported():
+        return [], None
+    after = parse_after(after)
+    params = [*params, match_query]
+    after_sql = ''
+    if after is not None:
+        after_sql = f'AND {index.table}.rowid < %s'
+        params.append(after)
+    with connection.cursor() as cursor:
+        cursor.execute(sql.format(after=after_sql), (*params, limit + 1))
+        rows = cursor.fetchall()
+    next_after = rows[limit - 1][0] if len(rows) > limit else None
+    return rows[:limit], next_after
+
+
+def search_news(query, after, limit):
+    """Новости, в заголовке или тексте которых есть все слова запроса."""
+    rows, next_after = run_search(
+        NEWS_INDEX, NEWS_SEARCH_SQL,
+        (HIGHLIGHT_START, HIGHLIGHT_END) * 2
+        + (SNIPPET_ELLIPSIS, SNIPPET_TOKENS),
+        query, after, limit,
+    )
+    return [
+        NewsHit(pk, render_highlight(title), render_highlight(snippet))
+        for pk, title, snippet in rows
+    ], next_after
+
+
+def search_comments(query, after, limit):
+    """Комментарии, в тексте которых есть все слова запроса."""
+    rows, next_after = run_search(
+        COMMENT_INDEX, COMMENT_SEARCH_SQL,
+        (HIGHLIGHT_START, HIGHLIGHT_END, SNIPPET_ELLIPSIS, SNIPPET_TOKENS),
+        query, after, limit,
+    )
+    return [
+        CommentHit(pk, news_id, news_title, render_highlight(snippet))
+        for pk, news_id, news_title, snippet in rows
+    ], next_after
@@ -0,0 +1,84 @@
+from collections import Counter
+
+from django.db.models import F
+from django.db.models.signals import (
+    post_delete,
+    post_save,
+    pre_delete,
+    pre_save,
+)
+from django.dispatch import receiver
+from django.utils import timezone
+
+from .archive import month_start, shift_month_counts
+from .forms import expire_bad_words
+from .models import BadWord, Comment, News
+
+
+@receiver(post_save, sender=Comment)
+def increment_comment_count(sender, instance, created, **kwargs):
+    """
+    Увеличиваем счётчик комментариев новости атомарным UPDATE.
+
+    Любое изменение комментария меняет и updated_at новости:
+    по нему проверяется актуальность страницы новости у клиента
+    и карточки новости в кеше.
+    """
+    changes = {'updated_at': timezone.now()}
+    if created:
+        changes['comment_count'] = F('comment_count') + 1
+    News.objects.filter(pk=instance.news_id).update(**changes)
+
+
+@receiver(post_delete, sender=Comment)
+def decrement_comment_count(sender, instance, **kwargs):
+    """
+    Уменьшаем счётчик комментариев новости атомарным UPDATE.
+
+    Сигнал приходит и при каскадном удалении, например вместе с автором.
+    """
+    News.objects.filter(pk=instance.news_id).update(
+        comment_count=F('comment_count') - 1, updated_at=timezone.now()
+    )
+
+
+@receiver(pre_save, sender=News)
+def load_saved_date(sender, instance, **kwargs):
+    """Дату новости, загруженной без поля date, берём из базы."""
+    if not instance._state.adding and instance.saved_date is None:
+        instance.saved_date = News.objects.filter(
+            pk=instance.pk
+        ).values_list('date', flat=True).first()
+
+
+@receiver(pre_save, sender=News)
+def fill_updated_at(sender, instance, raw, **kwargs):
+    """При загрузке через loaddata auto_now не срабатывает."""
+    if raw and instance.updated_at is None:
+        instance.updated_at = timezone.now()
+
+
+@receiver(post_save, sender=News)
+def update_news_months_on_save(sender, instance, created, **kwargs):
+    """Переносим новость между счётчиками месяцев, если дата сменилась."""
+    counts = Counter({month_start(instance.date): 1})
+    if not created and instance.saved_date is not None:
+        counts[month_start(instance.saved_date)] -= 1
+    shift_month_counts(counts)
+    instance.saved_date = instance.date
+
+
+@receiver(pre_delete, sender=News)
+def update_news_months_on_delete(sender, instance, **kwargs):
+    """
+    Дату читаем до удаления: у новости, загруженной без поля date,
+    после удаления его уже не из чего подгрузить.
+    """
+    shift_month_counts({month_start(instance.date): -1})
+
+
+@receiver(post_save, sender=BadWord)
+@receiver(post_delete, sender=BadWord)
+def reset_bad_words(sender, **kwargs):
+    """Остальные процессы перечитают словарь по истечении BAD_WORDS_TTL."""
+    expire_bad_words()
@@ -6,7 +6,24 @@ app_name = 'news'
 
 urlpatterns = [
     path('', views.NewsList.as_view(), name='home'),
+    path('search/', views.NewsSearch.as_view(), name='search'),
+    path('archive/', views.NewsArchive.as_view(), name='archive'),
+    path(
+        'archive/<int:year>/',
+        views.NewsArchive.as_view(),
+        name='archive_year'
+    ),
+    path(
+        'archive/<int:year>/<int:month>/',
+        views.NewsMonthArchive.as_view(),
+        name='archive_month'
+    ),
     path('news/<int:pk>/', views.NewsDetailView.as_view(), name='detail'),
+    path(
+        'news/<int:pk>/comments/',
+        views.NewsCommentsPage.as_view(),
+        name='comments'
+    ),
     path(
         'delete_comment/<int:pk>/',
         views.CommentDelete.as_view(),
@@ -1,13 +1,87 @@
+from datetime import date
+from hashlib import md5
+
 from django.conf import settings
 from django.contrib.auth.mixins import LoginRequiredMixin
+from django.http import Http404, HttpResponse
 from django.shortcuts import get_object_or_404
 from django.urls import reverse
+from django.utils.decorators import method_decorator
 from django.views import generic
+from django.views.decorators.http import condition
 
+from .archive import get_month_count, next_month
+from .cache import (
+    apply_comment_controls,
+    get_comments_fragment,
+    get_home_cards,
+)
 from .forms import CommentForm
-from .models import Comment, News
+from .models import Comment, News, NewsMonth
+from .pagination import KnownCountPaginator
+from .search import search_comments, search_news
+
+
+def get_home_news(request):
+    """
+    Новости главной для валидаторов и самой страницы.
+
+    Загружаются одним запросом: версия главной строится по данным,
+    а не по кешу, который у каждого процесса свой.
+    """
+    if not hasattr(request, 'home_news'):
+        news_list = News.objects.all()[:settings.NEWS_COUNT_ON_HOME_PAGE]
+        # Заполняем кеш queryset: object_list не сделает второго запроса.
+        len(news_list)
+        request.home_news = news_list
+    return request.home_news
+
+
+def home_etag(request, *args, **kwargs):
+    """
+    Условные запросы обслуживаем только для анонимов.
+
+    Страницы пользователя содержат CSRF-токен, который меняется при входе,
+    и закешированная у клиента форма после этого отклонялась бы.
+    Last-Modified главной не отдаём: удаление новости не сдвигает
+    время последнего изменения оставшихся.
+    """
+    if request.user.is_anonymous:
+        version = ','.join(
+            f'{news.pk}:{news.updated_at.timestamp()}'
+            for news in get_home_news(request)
+        )
+        return f'home-{md5(version.encode()).hexdigest()}'
+
+
+def get_news(request, pk):
+    """
+    Новость для валидаторов и самой страницы.
+
+    Загружается одним запросом по первичному ключу: для ответа 304
+    он единственный, а при полном ответе новость берёт NewsDetail.
+    """
+    if not hasattr(request, 'news'):
+        request.news = News.objects.filter(pk=pk).first()
+    return request.news
+
+
+def detail_etag(request, pk):
+    """Как и на главной, только для анонимов, см. home_etag."""
+    if request.user.is_anonymous:
+        news = get_news(request, pk)
+        if news is not None:
+            return f'news-{pk}-{news.updated_at.timestamp()}'
+
+
+def detail_last_modified(request, pk):
+    if request.user.is_anonymous:
+        news = get_news(request, pk)
+        if news is not None:
+            return news.updated_at
 
 
+@method_decorator(condition(etag_func=home_etag), name='get')
 class NewsList(generic.ListView):
     """Список новостей."""
     model = News
@@ -18,22 +92,40 @@ class NewsList(generic.ListView):
         Выводим только несколько последних новостей.
 
         Их количество определяется в настройках проекта.
+        Число комментариев хранится в самой новости,
+        поэтому комментарии для главной страницы не загружаются.
+        Список уже загружен для ETag, см. get_home_news.
         """
-        return self.model.objects.prefetch_related(
-            'comment_set'
-        )[:settings.NEWS_COUNT_ON_HOME_PAGE]
+        return get_home_news(self.request)
+
+    def get_context_data(self, **kwargs):
+        """Карточки новостей object_list берём из кеша."""
+        context = super().get_context_data(**kwargs)
+        context['news_cards'] = get_home_cards(context['object_list'])
+        return context
 
 
-class NewsDetail(generic.DetailView):
+class CommentsPageMixin:
+    """Добавляет в контекст первую страницу комментариев к новости."""
+
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+        context['comments_html'] = apply_comment_controls(
+            get_comments_fragment(self.object), self.request.user
+        )
+        return context
+
+
+class NewsDetail(CommentsPageMixin, generic.DetailView):
     model = News
     template_name = 'news/detail.html'
 
     def get_object(self, queryset=None):
-        obj = get_object_or_404(
-            self.model.objects.prefetch_related('comment_set__author'),
-            pk=self.kwargs['pk']
-        )
-        return obj
+        """Новость уже загружена при проверке ETag, см. get_news."""
+        news = getattr(self.request, 'news', None)
+        if news is not None:
+            return news
+        return super().get_object(queryset)
 
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
@@ -42,8 +134,18 @@ class NewsDetail(generic.DetailView):
         return context
 
 
+class NewsCommentsPage(generic.View):
+    """Следующая страница комментариев в виде HTML-фрагмента."""
+
+    def get(self, request, *args, **kwargs):
+        news = get_object_or_404(News, pk=self.kwargs['pk'])
+        fragment = get_comments_fragment(news, request.GET.get('after'))
+        return HttpResponse(apply_comment_controls(fragment, request.user))
+
+
 class NewsComment(
         LoginRequiredMixin,
+        CommentsPageMixin,
         generic.detail.SingleObjectMixin,
         generic.FormView
 ):
@@ -63,19 +165,102 @@ class NewsComment(
         return super().form_valid(form)
 
     def get_success_url(self):
-        post = self.get_object()
-        return reverse('news:detail', kwargs={'pk': post.pk}) + '#comments'
+        """Новость уже загружена в post, повторно её не запрашиваем."""
+        return reverse(
+            'news:detail', kwargs={'pk': self.object.pk}
+        ) + '#comments'
 
 
 class NewsDetailView(generic.View):
+    # Представления создаются один раз, а не на каждый запрос.
+    detail_view = staticmethod(NewsDetail.as_view())
+    comment_view = staticmethod(NewsComment.as_view())
 
+    @method_decorator(condition(
+        etag_func=detail_etag, last_modified_func=detail_last_modified
+    ))
     def get(self, request, *args, **kwargs):
-        view = NewsDetail.as_view()
-        return view(request, *args, **kwargs)
+        return self.detail_view(request, *args, **kwargs)
 
     def post(self, request, *args, **kwargs):
-        view = NewsComment.as_view()
-        return view(request, *args, **kwargs)
+        return self.comment_view(request, *args, **kwargs)
+
+
+class NewsSearch(generic.TemplateView):
+    """
+    Полнотекстовый поиск по новостям или комментариям.
+
+    Выдача идёт от новых записей к старым, следующая страница
+    запрашивается по id последней показанной записи.
+    """
+    template_name = 'news/search.html'
+    scopes = {'news': search_news, 'comments': search_comments}
+
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+        query = self.request.GET.get('q', '')
+        scope = self.request.GET.get('in')
+        if scope not in self.scopes:
+            scope = 'news'
+        hits, next_after = self.scopes[scope](
+            query,
+            self.request.GET.get('after'),
+            settings.NEWS_COUNT_ON_SEARCH_PAGE,
+        )
+        context.update(
+            query=query, scope=scope, hits=hits, next_after=next_after
+        )
+        return context
+
+
+class NewsArchive(generic.ListView):
+    """Архив: месяцы с числом новостей, за все годы или за один."""
+    template_name = 'news/archive.html'
+
+    def get_queryset(self):
+        queryset = NewsMonth.objects.filter(count__gt=0)
+        if 'year' in self.kwargs:
+            year = self.kwargs['year']
+            try:
+                start, end = date(year, 1, 1), date(year + 1, 1, 1)
+            except ValueError:
+                raise Http404('Некорректный год.')
+            queryset = queryset.filter(month__gte=start, month__lt=end)
+        return queryset
+
+
+class NewsMonthArchive(generic.ListView):
+    """
+    Новости за месяц.
+
+    Выборка идёт по диапазону дат по индексу (-date, id),
+    а число новостей для пагинатора берётся из NewsMonth.
+    """
+    template_name = 'news/archive_month.html'
+    paginator_class = KnownCountPaginator
+
+    def get_paginate_by(self, queryset):
+        return settings.NEWS_COUNT_ON_ARCHIVE_PAGE
+
+    def get_queryset(self):
+        try:
+            self.month = date(self.kwargs['year'], self.kwargs['month'], 1)
+            end = next_month(self.month)
+        except ValueError:
+            raise Http404('Некорректная дата.')
+        return News.objects.filter(
+            date__gte=self.month, date__lt=end
+        ).order_by('-date', 'id')
+
+    def get_paginator(self, queryset, per_page, **kwargs):
+        return super().get_paginator(
+            queryset, per_page, count=get_month_count(self.month), **kwargs
+        )
+
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+        context['month'] = self.month
+        return context
 
 
 class CommentBase(LoginRequiredMixin):
@@ -83,9 +268,12 @@ class CommentBase(LoginRequiredMixin):
     model = Comment
 
     def get_success_url(self):
-        comment = self.get_object()
+        """
+        Комментарий уже загружен в post, а для адреса нужен только
+        id новости, поэтому ни комментарий, ни новость не запрашиваем.
+        """
         return reverse(
-            'news:detail', kwargs={'pk': comment.news.pk}
+            'news:detail', kwargs={'pk': self.object.news_id}
         ) + '#comments'
 
     def get_queryset(self):
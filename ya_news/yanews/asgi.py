@@ -10,7 +10,12 @@ https://docs.djangoproject.com/en/3.2/howto/deployment/asgi/
 import os
 
 from django.core.asgi import get_asgi_application
+from django.template import engines
 
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'yanews.settings')
 
 application = get_asgi_application()
+
+# Шаблонизаторы создаются при старте, а не на первом запросе:
+# так с опцией warm_up шаблоны компилируются до приёма запросов.
+engines.all()
@@ -0,0 +1,46 @@
+"""
+Настройки для боевого запуска.
+
+Шаблоны загружаются кешированным загрузчиком и компилируются при старте
+(wsgi.py и asgi.py создают движки сразу), а сводка времени их рендеринга
+пишется в журнал yanews.templating.
+"""
+from .settings import *  # noqa: F401,F403
+from .settings import TEMPLATES
+
+DEBUG = False
+
+TEMPLATES = [{
+    **TEMPLATES[0],
+    'BACKEND': 'yanews.templating.TimedDjangoTemplates',
+    'NAME': 'django',
+    'APP_DIRS': False,
+    'OPTIONS': {
+        **TEMPLATES[0]['OPTIONS'],
+        'loaders': [(
+            'django.template.loaders.cached.Loader', [
+                'django.template.loaders.filesystem.Loader',
+                'django.template.loaders.app_directories.Loader',
+            ],
+        )],
+        'warm_up': True,
+    },
+}]
+
+# Профилируется каждый сотый запрос, если REQUEST_PROFILING=1.
+REQUEST_PROFILING_SAMPLE_RATE = 0.01
+
+LOGGING = {
+    'version': 1,
+    'disable_existing_loggers': False,
+    'handlers': {
+        'console': {'class': 'logging.StreamHandler'},
+    },
+    'loggers': {
+        'yanews.templating': {
+            'handlers': ['console'],
+            # DEBUG добавит строку на каждый рендеринг шаблона.
+            'level': 'INFO',
+        },
+    },
+}
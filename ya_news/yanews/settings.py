@@ -1,3 +1,4 @@
+import os
 from pathlib import Path
 
 from django.urls import reverse_lazy
@@ -21,6 +22,7 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    'news.profiling.ProfilingMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
@@ -58,6 +60,13 @@ DATABASES = {
     }
 }
 
+# Подойдёт и FileBasedCache: кеш новостей использует только get/set/delete.
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+    }
+}
+
 
 AUTH_PASSWORD_VALIDATORS = []
 
@@ -80,3 +89,28 @@ LOGIN_URL = reverse_lazy('users:login')
 LOGIN_REDIRECT_URL = reverse_lazy('news:home')
 
 NEWS_COUNT_ON_HOME_PAGE = 10
+
+NEWS_COUNT_ON_SEARCH_PAGE = 20
+
+NEWS_COUNT_ON_ARCHIVE_PAGE = 20
+
+NEWS_CACHE_TIMEOUT = 300
+
+BAD_WORDS_MATCHER = 'news.moderation.AhoCorasickBadWordsMatcher'
+# Как часто каждый процесс перечитывает словарь BadWord из базы, в секундах.
+BAD_WORDS_TTL = 5
+
+COMMENTS_COUNT_ON_DETAIL_PAGE = 50
+
+# Профилирование запросов, см. news/profiling.py.
+REQUEST_PROFILING = os.environ.get('REQUEST_PROFILING') == '1'
+
+REQUEST_PROFILING_SAMPLE_RATE = 1.0
+
+REQUEST_PROFILING_WINDOW = 1000
+
+REQUEST_PROFILING_FLUSH_EVERY = 20
+
+# Раз в столько рендерингов шаблонов в журнал пишется их сводка,
+# см. yanews/templating.py.
+TEMPLATE_STATS_LOG_EVERY = 1000
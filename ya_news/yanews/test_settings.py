@@ -0,0 +1,49 @@
+"""
+Настройки для тестов.
+
+Те же, что в settings.py, но с самыми дешёвыми компонентами, которые
+не меняют поведение проверяемого кода. Сессии остаются в базе:
+их строки входят в данные фикстур.
+"""
+from .settings import *  # noqa: F401,F403
+from .settings import MIDDLEWARE, TEMPLATES
+
+PASSWORD_HASHERS = ['django.contrib.auth.hashers.MD5PasswordHasher']
+
+DATABASES = {
+    'default': {
+        'ENGINE': 'django.db.backends.sqlite3',
+        'NAME': ':memory:',
+    }
+}
+
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+    }
+}
+
+EMAIL_BACKEND = 'django.core.mail.backends.locmem.EmailBackend'
+
+# Заголовки безопасности тесты не проверяют.
+MIDDLEWARE = [
+    middleware for middleware in MIDDLEWARE
+    if middleware not in (
+        'django.middleware.security.SecurityMiddleware',
+        'django.middleware.clickjacking.XFrameOptionsMiddleware',
+    )
+]
+
+TEMPLATES = [{
+    **TEMPLATES[0],
+    'APP_DIRS': False,
+    'OPTIONS': {
+        **TEMPLATES[0]['OPTIONS'],
+        'loaders': [(
+            'django.template.loaders.cached.Loader', [
+                'django.template.loaders.filesystem.Loader',
+                'django.template.loaders.app_directories.Loader',
+            ],
+        )],
+    },
+}]
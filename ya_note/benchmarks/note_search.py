@@ -0,0 +1,79 @@
+"""
+Полнотекстовый поиск по заметкам при большом их числе.
+
+Запуск из директории ya_note:
+    python -m benchmarks.note_search 1000000
+"""
+import argparse
+import random
+import statistics
+import time
+from itertools import accumulate
+
+from .utils import scratch_database
+
+DEFAULT_SIZE = 1_000_000
+AUTHORS = 1000
+REPEAT = 50
+ALPHABET = 'абвгдежзиклмнопрстуфхцчшэюя'
+VOCABULARY_SIZE = 20_000
+# Позиции слов в словаре (по частоте) для запросов: от самых частых
+# до редких, частота распределена по закону Ципфа.
+QUERY_RANKS = ((0,), (1, 2), (10,), (100, 500), (5000,))
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('size', nargs='?', type=int, default=DEFAULT_SIZE)
+    args = parser.parse_args()
+    rng = random.Random(0)
+    vocabulary = [
+        ''.join(rng.choices(ALPHABET, k=rng.randint(3, 10)))
+        for _ in range(VOCABULARY_SIZE)
+    ]
+    weights = list(accumulate(
+        1 / rank for rank in range(1, VOCABULARY_SIZE + 1)
+    ))
+
+    def words(count):
+        return ' '.join(rng.choices(vocabulary, cum_weights=weights, k=count))
+
+    with scratch_database():
+        from django.contrib.auth import get_user_model
+        from notes.models import Note
+        from notes.search import search_note_ids
+        User = get_user_model()
+        User.objects.bulk_create(
+            User(username=f'user{index}') for index in range(AUTHORS)
+        )
+        author_ids = list(User.objects.values_list('pk', flat=True))
+        started = time.monotonic()
+        for start in range(0, args.size, 10_000):
+            Note.objects.bulk_create(
+                Note(
+                    title=words(3),
+                    text=words(40),
+                    author_id=rng.choice(author_ids),
+                    slug=f'note-{index}',
+                )
+                for index in range(start, min(start + 10_000, args.size))
+            )
+        print(f'{args.size} заметок проиндексировано за '
+              f'{time.monotonic() - started:.0f} с')
+        for ranks in QUERY_RANKS:
+            query = ' '.join(vocabulary[rank] for rank in ranks)
+            timings = []
+            for _ in range(REPEAT):
+                author_id = rng.choice(author_ids)
+                started = time.perf_counter()
+                search_note_ids(query, author_id, 50)
+                timings.append(time.perf_counter() - started)
+            print(
+                f'слова №{ranks} по частоте: медиана '
+                f'{statistics.median(timings) * 1e3:.1f} мс, '
+                f'максимум {max(timings) * 1e3:.1f} мс'
+            )
+
+
+if __name__ == '__main__':
+    main()
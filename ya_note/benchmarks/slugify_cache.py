@@ -0,0 +1,57 @@
+"""
+Транслитерация пачек заголовков с кешем и без него.
+
+Запуск из директории ya_note:
+    python -m benchmarks.slugify_cache
+"""
+import os
+import random
+import time
+
+import django
+
+BATCH_SIZE = 100_000
+DISTINCT_TITLES = (100, 1_000, 10_000, 100_000)
+WORDS = (
+    'заметка', 'список', 'покупок', 'идея', 'проект', 'встреча', 'план',
+    'задача', 'отпуск', 'книга', 'рецепт', 'пароль', 'дом', 'работа',
+)
+
+
+def make_titles(rng, distinct):
+    titles = [
+        ' '.join(rng.choice(WORDS) for _ in range(3)) + f' {index}'
+        for index in range(distinct)
+    ]
+    return [rng.choice(titles) for _ in range(BATCH_SIZE)]
+
+
+def main():
+    os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'yanote.settings')
+    django.setup()
+    from pytils.translit import slugify as translit_slugify
+    from notes import slugs
+    rng = random.Random(0)
+    print(f'Пачка из {BATCH_SIZE} заголовков, '
+          f'размер кеша {slugs.slugify.cache_info().maxsize}')
+    for distinct in DISTINCT_TITLES:
+        titles = make_titles(rng, distinct)
+        started = time.perf_counter()
+        for title in titles:
+            translit_slugify(title)
+        plain_time = time.perf_counter() - started
+        slugs.slugify.cache_clear()
+        started = time.perf_counter()
+        for title in titles:
+            slugs.slugify(title)
+        cached_time = time.perf_counter() - started
+        stats = slugs.get_slugify_stats()
+        print(
+            f'{distinct} разных: pytils {plain_time:.2f} с, '
+            f'с кешем {cached_time:.2f} с, '
+            f'попаданий {stats["hit_rate"]:.0%}'
+        )
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,63 @@
+"""
+Подбор свободного slug при большом числе заметок с одинаковым заголовком.
+
+Запуск из директории ya_note:
+    python -m benchmarks.unique_slug 1000 10000 100000
+"""
+import argparse
+import time
+
+from .utils import scratch_database
+
+DEFAULT_SIZES = (1_000, 10_000, 100_000)
+TITLE = 'Название заметки'
+REPEAT = 20
+
+
+def probe_slug(queryset, slug):
+    """Прежний подход: проверка суффиксов по одному через exists()."""
+    candidate = slug
+    suffix = 0
+    while queryset.filter(slug=candidate).exists():
+        suffix += 1
+        candidate = f'{slug}-{suffix}'
+    return candidate
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('sizes', nargs='*', type=int, default=DEFAULT_SIZES)
+    args = parser.parse_args()
+    with scratch_database():
+        from django.contrib.auth import get_user_model
+        from pytils.translit import slugify
+        from notes.models import Note
+        from notes.slugs import make_unique_slug
+        author = get_user_model().objects.create(username='benchmark')
+        slug = slugify(TITLE)
+        created = 0
+        for size in args.sizes:
+            Note.objects.bulk_create(
+                (
+                    Note(title=TITLE, text='Текст', author=author,
+                         slug=f'{slug}-{index}' if index else slug)
+                    for index in range(created, size)
+                ),
+                batch_size=5000,
+            )
+            created = size
+            started = time.perf_counter()
+            for _ in range(REPEAT):
+                new_slug = make_unique_slug(Note.objects, TITLE, 100)
+            unique_time = (time.perf_counter() - started) / REPEAT
+            started = time.perf_counter()
+            assert probe_slug(Note.objects, slug) == new_slug
+            probe_time = time.perf_counter() - started
+            print(
+                f'{size} заметок: make_unique_slug {unique_time * 1e3:.2f} мс,'
+                f' перебор exists() {probe_time * 1e3:.0f} мс'
+            )
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,73 @@
+"""
+Запросы, время и память каждого адреса notes.urls на больших данных.
+
+Результаты сравниваются с базовой линией url_regressions.json;
+при росте числа запросов или времени и памяти сверх порога
+бенчмарк завершается с ошибкой.
+
+Запуск из директории ya_note:
+    python -m benchmarks.url_regressions
+    python -m benchmarks.url_regressions --update  # новая базовая линия
+"""
+import random
+from pathlib import Path
+from urllib.parse import urlencode
+
+from .factories import Words, bulk_create, create_users, deferred_search_index
+from .utils import run_url_regressions
+
+BASELINE_PATH = Path(__file__).with_name('url_regressions.json')
+NOTES_COUNT = 500_000
+USERS_COUNT = 5000
+# У замеряемого автора заметок больше, чем у остальных.
+AUTHOR_NOTES = 1000
+
+
+def seed(scale):
+    from django.contrib.auth import get_user_model
+    from django.test import Client
+    from django.urls import reverse
+    from notes.models import Note
+
+    rng = random.Random(0)
+    words = Words()
+    notes_count = max(int(NOTES_COUNT * scale), AUTHOR_NOTES)
+    user_ids = create_users(max(int(USERS_COUNT * scale), 2))
+    with deferred_search_index():
+        bulk_create(Note, (
+            Note(
+                title=words(3),
+                text=words(40),
+                author_id=user_ids[0] if index < AUTHOR_NOTES else rng.choice(
+                    user_ids
+                ),
+                slug=f'note-{index}',
+            )
+            for index in range(notes_count)
+        ))
+
+    author = Client()
+    author.force_login(get_user_model().objects.get(pk=user_ids[0]))
+    note = Note.objects.filter(author_id=user_ids[0]).order_by('pk').last()
+    list_url = reverse('notes:list')
+    search_url = reverse('notes:search') + '?'
+    return {
+        'home': (Client(), reverse('notes:home')),
+        'home:author': (author, reverse('notes:home')),
+        'add': (author, reverse('notes:add')),
+        'edit': (author, reverse('notes:edit', args=(note.slug,))),
+        'detail': (author, reverse('notes:detail', args=(note.slug,))),
+        'delete': (author, reverse('notes:delete', args=(note.slug,))),
+        'list': (author, list_url),
+        'list_more': (author, reverse('notes:list_more') + '?' + urlencode(
+            {'after': note.pk - AUTHOR_NOTES // 2}
+        )),
+        'search': (author, search_url + urlencode(
+            {'q': words.vocabulary[100]}
+        )),
+        'success': (author, reverse('notes:success')),
+    }
+
+
+if __name__ == '__main__':
+    run_url_regressions('notes', seed, BASELINE_PATH)
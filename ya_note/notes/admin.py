@@ -1,5 +1,20 @@
 from django.contrib import admin
 
-from .models import Note
+from .models import Note, RequestTiming
 
 admin.site.register(Note)
+
+
+@admin.register(RequestTiming)
+class RequestTimingAdmin(admin.ModelAdmin):
+    list_display = (
+        'url_name', 'metric', 'p50', 'p95', 'p99', 'samples', 'updated_at'
+    )
+    list_filter = ('metric',)
+    search_fields = ('url_name',)
+
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
@@ -0,0 +1,20 @@
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+
+from notes import search
+
+
+class Command(BaseCommand):
+    help = (
+        'Пересоздаёт триггеры полнотекстового индекса заметок '
+        'и заново индексирует все заметки.'
+    )
+
+    def handle(self, *args, **options):
+        if not search.is_supported():
+            raise CommandError(
+                'Полнотекстовый поиск работает только с SQLite.'
+            )
+        with connection.cursor() as cursor:
+            search.install(cursor, rebuild=True)
+        self.stdout.write('Индекс заметок перестроен.')
@@ -0,0 +1,69 @@
+from django.db import migrations
+
+# SQL зафиксирован здесь, а не берётся из notes.search:
+# миграция должна выполняться так же, как при её создании.
+CREATE_SQL = (
+    """
+    CREATE VIRTUAL TABLE IF NOT EXISTS notes_note_fts USING fts5(
+        title, text, author_id, content='notes_note', content_rowid='id',
+        tokenize='unicode61 remove_diacritics 2'
+    )
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS notes_note_fts_insert
+    AFTER INSERT ON notes_note BEGIN
+        INSERT INTO notes_note_fts(rowid, title, text, author_id)
+        VALUES (new.id, new.title, new.text, new.author_id);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS notes_note_fts_delete
+    AFTER DELETE ON notes_note BEGIN
+        INSERT INTO notes_note_fts(
+            notes_note_fts, rowid, title, text, author_id
+        )
+        VALUES ('delete', old.id, old.title, old.text, old.author_id);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS notes_note_fts_update
+    AFTER UPDATE OF title, text, author_id ON notes_note BEGIN
+        INSERT INTO notes_note_fts(
+            notes_note_fts, rowid, title, text, author_id
+        )
+        VALUES ('delete', old.id, old.title, old.text, old.author_id);
+        INSERT INTO notes_note_fts(rowid, title, text, author_id)
+        VALUES (new.id, new.title, new.text, new.author_id);
+    END
+    """,
+    "INSERT INTO notes_note_fts(notes_note_fts) VALUES ('rebuild')",
+)
+
+DROP_SQL = (
+    'DROP TRIGGER IF EXISTS notes_note_fts_insert',
+    'DROP TRIGGER IF EXISTS notes_note_fts_delete',
+    'DROP TRIGGER IF EXISTS notes_note_fts_update',
+    'DROP TABLE IF EXISTS notes_note_fts',
+)
+
+
+def run_sql(statements):
+    """Полнотекстовый поиск есть только в SQLite."""
+    def run(apps, schema_editor):
+        if schema_editor.connection.vendor != 'sqlite':
+            return
+        with schema_editor.connection.cursor() as cursor:
+            for sql in statements:
+                cursor.execute(sql)
+    return run
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('notes', '0002_indexes'),
+    ]
+
+    operations = [
+        migrations.RunPython(run_sql(CREATE_SQL), run_sql(DROP_SQL)),
+    ]
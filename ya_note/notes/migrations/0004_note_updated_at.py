@@ -0,0 +1,61 @@
+# Generated by Django 3.2.15 on 2026-10-18 17:41
+
+from django.db import migrations, models
+
+# Триггеры индекса заметок из 0003_note_search.
+TRIGGERS_SQL = (
+    """
+    CREATE TRIGGER IF NOT EXISTS notes_note_fts_insert
+    AFTER INSERT ON notes_note BEGIN
+        INSERT INTO notes_note_fts(rowid, title, text, author_id)
+        VALUES (new.id, new.title, new.text, new.author_id);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS notes_note_fts_delete
+    AFTER DELETE ON notes_note BEGIN
+        INSERT INTO notes_note_fts(
+            notes_note_fts, rowid, title, text, author_id
+        )
+        VALUES ('delete', old.id, old.title, old.text, old.author_id);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS notes_note_fts_update
+    AFTER UPDATE OF title, text, author_id ON notes_note BEGIN
+        INSERT INTO notes_note_fts(
+            notes_note_fts, rowid, title, text, author_id
+        )
+        VALUES ('delete', old.id, old.title, old.text, old.author_id);
+        INSERT INTO notes_note_fts(rowid, title, text, author_id)
+        VALUES (new.id, new.title, new.text, new.author_id);
+    END
+    """,
+)
+
+
+def reinstall_search_triggers(apps, schema_editor):
+    """SQLite пересоздаёт таблицу при AddField и теряет её триггеры."""
+    if schema_editor.connection.vendor != 'sqlite':
+        return
+    with schema_editor.connection.cursor() as cursor:
+        for sql in TRIGGERS_SQL:
+            cursor.execute(sql)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('notes', '0003_note_search'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='note',
+            name='updated_at',
+            field=models.DateTimeField(auto_now=True, verbose_name='Изменена'),
+        ),
+        migrations.RunPython(
+            reinstall_search_triggers, migrations.RunPython.noop
+        ),
+    ]
@@ -0,0 +1,35 @@
+# Generated by Django 3.2.15 on 2026-10-18 18:19
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('notes', '0004_note_updated_at'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='RequestTiming',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('url_name', models.CharField(max_length=200, verbose_name='Адрес')),
+                ('metric', models.CharField(choices=[('total_ms', 'Всего, мс'), ('sql_ms', 'SQL, мс'), ('render_ms', 'Шаблоны, мс'), ('queries', 'Запросов к базе')], max_length=20, verbose_name='Метрика')),
+                ('samples', models.PositiveIntegerField(verbose_name='Замеров в окне')),
+                ('p50', models.FloatField(verbose_name='p50')),
+                ('p95', models.FloatField(verbose_name='p95')),
+                ('p99', models.FloatField(verbose_name='p99')),
+                ('updated_at', models.DateTimeField(auto_now=True, verbose_name='Обновлено')),
+            ],
+            options={
+                'verbose_name': 'Время ответа',
+                'verbose_name_plural': 'Время ответа по адресам',
+                'ordering': ('url_name', 'metric'),
+            },
+        ),
+        migrations.AddConstraint(
+            model_name='requesttiming',
+            constraint=models.UniqueConstraint(fields=('url_name', 'metric'), name='unique_request_timing'),
+        ),
+    ]
@@ -1,7 +1,10 @@
 from django.conf import settings
-from django.db import models
+from django.db import IntegrityError, models, transaction
 
-from pytils.translit import slugify
+from .slugs import make_unique_slug
+
+# Сколько раз пробовать новый slug, если его успел занять параллельный запрос.
+SLUG_ATTEMPTS = 5
 
 
 class Note(models.Model):
@@ -27,12 +30,59 @@ class Note(models.Model):
         settings.AUTH_USER_MODEL,
         on_delete=models.CASCADE,
     )
+    updated_at = models.DateTimeField('Изменена', auto_now=True)
+
+    class Meta:
+        indexes = (
+            models.Index(fields=('author', 'id'), name='note_author_idx'),
+        )
 
     def __str__(self):
         return self.title
 
     def save(self, *args, **kwargs):
-        if not self.slug:
-            max_slug_length = self._meta.get_field('slug').max_length
-            self.slug = slugify(self.title)[:max_slug_length]
-        super().save(*args, **kwargs)
+        if self.slug:
+            return super().save(*args, **kwargs)
+        max_slug_length = self._meta.get_field('slug').max_length
+        for attempt in range(SLUG_ATTEMPTS):
+            self.slug = make_unique_slug(
+                Note.objects.exclude(pk=self.pk), self.title, max_slug_length
+            )
+            try:
+                with transaction.atomic():
+                    return super().save(*args, **kwargs)
+            except IntegrityError:
+                if attempt == SLUG_ATTEMPTS - 1:
+                    raise
+
+
+class RequestTiming(models.Model):
+    # Перцентили одной метрики запросов к адресу за скользящее окно.
+    # Пишутся middleware профилирования, см. notes/profiling.py.
+    METRICS = (
+        ('total_ms', 'Всего, мс'),
+        ('sql_ms', 'SQL, мс'),
+        ('render_ms', 'Шаблоны, мс'),
+        ('queries', 'Запросов к базе'),
+    )
+
+    url_name = models.CharField('Адрес', max_length=200)
+    metric = models.CharField('Метрика', max_length=20, choices=METRICS)
+    samples = models.PositiveIntegerField('Замеров в окне')
+    p50 = models.FloatField('p50')
+    p95 = models.FloatField('p95')
+    p99 = models.FloatField('p99')
+    updated_at = models.DateTimeField('Обновлено', auto_now=True)
+
+    class Meta:
+        ordering = ('url_name', 'metric')
+        constraints = (
+            models.UniqueConstraint(
+                fields=('url_name', 'metric'), name='unique_request_timing'
+            ),
+        )
+        verbose_name_plural = 'Время ответа по адресам'
+        verbose_name = 'Время ответа'
+
+    def __str__(self):
+        return f'{self.url_name} {self.metric}: p95 {self.p95:.1f}'
@@ -0,0 +1,99 @@
+import re
+
+from django.db import connection
+
+FTS_TABLE = 'notes_note_fts'
+# Индекс с внешним содержимым: тексты хранятся только в notes_note,
+# а триггеры обновляют индекс при любой записи, включая bulk_create.
+# Столбец author_id индексируется, чтобы фильтр по автору выполнялся
+# внутри полнотекстового запроса, а не после ранжирования всех совпадений.
+CREATE_FTS_SQL = (
+    f"CREATE VIRTUAL TABLE IF NOT EXISTS {FTS_TABLE} USING fts5("
+    "title, text, author_id, "
+    "content='notes_note', content_rowid='id', "
+    "tokenize='unicode61 remove_diacritics 2')"
+)
+CREATE_TRIGGERS_SQL = (
+    f"""CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_insert
+    AFTER INSERT ON notes_note BEGIN
+        INSERT INTO {FTS_TABLE}(rowid, title, text, author_id)
+        VALUES (new.id, new.title, new.text, new.author_id);
+    END""",
+    f"""CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_delete
+    AFTER DELETE ON notes_note BEGIN
+        INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, title, text, author_id)
+        VALUES ('delete', old.id, old.title, old.text, old.author_id);
+    END""",
+    f"""CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_update
+    AFTER UPDATE OF title, text, author_id ON notes_note BEGIN
+        INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, title, text, author_id)
+        VALUES ('delete', old.id, old.title, old.text, old.author_id);
+        INSERT INTO {FTS_TABLE}(rowid, title, text, author_id)
+        VALUES (new.id, new.title, new.text, new.author_id);
+    END""",
+)
+DROP_SQL = (
+    f'DROP TRIGGER IF EXISTS {FTS_TABLE}_insert',
+    f'DROP TRIGGER IF EXISTS {FTS_TABLE}_delete',
+    f'DROP TRIGGER IF EXISTS {FTS_TABLE}_update',
+    f'DROP TABLE IF EXISTS {FTS_TABLE}',
+)
+REBUILD_SQL = f"INSERT INTO {FTS_TABLE}({FTS_TABLE}) VALUES ('rebuild')"
+# Заголовок важнее текста; столбец автора на ранжирование не влияет.
+SEARCH_SQL = (
+    f'SELECT rowid FROM {FTS_TABLE} WHERE {FTS_TABLE} MATCH %s '
+    f'ORDER BY bm25({FTS_TABLE}, 10.0, 1.0, 0.0) LIMIT %s'
+)
+WORD_RE = re.compile(r'\w+')
+
+
+def is_supported(connection=connection):
+    return connection.vendor == 'sqlite'
+
+
+def install(cursor, rebuild=False):
+    """
+    Создаёт индекс и триггеры, если их нет.
+
+    Триггеры нужно переустанавливать после миграций, пересоздающих
+    таблицу notes_note: SQLite удаляет их вместе со старой таблицей.
+    """
+    cursor.execute(CREATE_FTS_SQL)
+    for sql in CREATE_TRIGGERS_SQL:
+        cursor.execute(sql)
+    if rebuild:
+        cursor.execute(REBUILD_SQL)
+
+
+def uninstall(cursor):
+    for sql in DROP_SQL:
+        cursor.execute(sql)
+
+
+def build_match_query(query, author_id):
+    """
+    Превращает пользовательский ввод в запрос FTS5.
+
+    Все слова обязательны; спецсимволы синтаксиса FTS5 отбрасываются
+    вместе с остальной пунктуацией. Поиск по префиксу и фильтр столбцов
+    заметно замедляют FTS5, поэтому фильтр {title text} ставится только
+    у чисел: только они могут совпасть со значением author_id.
+    """
+    words = WORD_RE.findall(query)
+    if not words:
+        return None
+    terms = [
+        f'{{title text}}: "{word}"' if word.isdigit() else f'"{word}"'
+        for word in words
+    ]
+    return ' AND '.join([f'author_id: "{author_id}"', *terms])
+
+
+def search_note_ids(query, author_id, limit):
+    """Id заметок автора, отсортированные по релевантности."""
+    match_query = build_match_query(query, author_id)
+    if match_query is None or not is_supported():
+        return []
+    with connection.cursor() as cursor:
+        cursor.execute(SEARCH_SQL, (match_query, limit))
+        return [row[0] for row in cursor.fetchall()]
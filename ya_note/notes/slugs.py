@@ -0,0 +1,72 @@
+import re
+from functools import lru_cache
+
+from django.conf import settings
+from django.core.signals import setting_changed
+from django.db.models import Count, IntegerField, Max, Q
+from django.db.models.functions import Cast, Substr
+from django.dispatch import receiver
+from pytils.translit import slugify as translit_slugify
+
+SUFFIX_SEPARATOR = '-'
+# Место под суффикс вида «-123456789», если slug пришлось дополнить им.
+SUFFIX_MAX_LENGTH = 10
+
+
+def build_slugify():
+    return lru_cache(maxsize=settings.NOTES_SLUG_CACHE_SIZE)(
+        translit_slugify
+    )
+
+
+# Транслитерация одинаковых заголовков выполняется один раз на процесс.
+slugify = build_slugify()
+
+
+@receiver(setting_changed)
+def rebuild_slugify(setting, **kwargs):
+    global slugify
+    if setting == 'NOTES_SLUG_CACHE_SIZE':
+        slugify = build_slugify()
+
+
+def get_slugify_stats():
+    """Статистика кеша транслитерации текущего процесса."""
+    info = slugify.cache_info()
+    calls = info.hits + info.misses
+    return {
+        'hits': info.hits,
+        'misses': info.misses,
+        'size': info.currsize,
+        'max_size': info.maxsize,
+        'hit_rate': info.hits / calls if calls else 0.0,
+    }
+
+
+def make_unique_slug(queryset, text, max_length):
+    """
+    Slug из текста, не занятый ни одной записью queryset.
+
+    Если slug занят, добавляется суффикс «-N» со следующим свободным
+    номером, а место под него освобождается укорачиванием slug.
+    Номер ищется одним запросом по диапазону уникального индекса
+    [stem, stem + '.'): в slug допустимы только [-_a-z0-9], поэтому
+    в диапазон попадают только сам stem и stem с суффиксом через дефис.
+    """
+    slug = slugify(text)[:max_length]
+    stem = slug[:max_length - SUFFIX_MAX_LENGTH]
+    # Только суффиксы из цифр: SQLite приведёт «-1-draft» к 1,
+    # а другие СУБД на таком Cast упадут.
+    suffix_re = rf'^{re.escape(stem + SUFFIX_SEPARATOR)}\d+$'
+    stats = queryset.filter(
+        Q(slug=slug) | Q(slug__gte=stem, slug__lt=stem + '.')
+    ).aggregate(
+        taken=Count('pk', filter=Q(slug=slug)),
+        last_suffix=Max(
+            Cast(Substr('slug', len(stem) + 2), IntegerField()),
+            filter=Q(slug__regex=suffix_re),
+        ),
+    )
+    if not stats['taken']:
+        return slug
+    return f'{stem}{SUFFIX_SEPARATOR}{(stats["last_suffix"] or 0) + 1}'
@@ -8,6 +8,7 @@ from .constants import (
     DETAIL_URL,
     EDIT_URL,
     HOME_URL,
+    LIST_MORE_URL,
     LIST_URL,
     LOGIN_URL,
     LOGOUT_URL,
@@ -16,6 +17,7 @@ from .constants import (
     NEW_SLUG,
     NOTE_TEXT,
     NOTE_TITLE,
+    SEARCH_URL,
     SIGNUP_URL,
     SLUG,
     SUCCESS_URL,
@@ -45,6 +47,8 @@ class BaseTestCase(TestCase):
         cls.urls = (
             HOME_URL,
             LIST_URL,
+            LIST_MORE_URL,
+            SEARCH_URL,
             ADD_URL,
             SUCCESS_URL,
             DETAIL_URL,
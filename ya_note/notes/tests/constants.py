@@ -10,6 +10,8 @@ NEW_SLUG = 'new-slug'
 
 HOME_URL = reverse('notes:home')
 LIST_URL = reverse('notes:list')
+LIST_MORE_URL = reverse('notes:list_more')
+SEARCH_URL = reverse('notes:search')
 ADD_URL = reverse('notes:add')
 SUCCESS_URL = reverse('notes:success')
 DETAIL_URL = reverse('notes:detail', args=(SLUG,))
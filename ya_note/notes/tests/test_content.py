@@ -1,6 +1,26 @@
+import re
+from http import HTTPStatus
+
+from asgiref.sync import async_to_sync, sync_to_async
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.http import HttpResponse
+from django.test import Client, RequestFactory, override_settings
+from django.urls import reverse
+
 from notes.forms import NoteForm
+from notes.models import Note, RequestTiming
+from notes.profiling import METRICS, ProfilingMiddleware, timing_windows
+from yanote.templating import TimedDjangoTemplates, template_stats
 from .base_test import BaseTestCase
-from .constants import ADD_URL, EDIT_URL, LIST_URL
+from .constants import (ADD_URL, DETAIL_URL, EDIT_URL, LIST_MORE_URL,
+                        LIST_URL, SEARCH_URL)
+
+SERVER_TIMING_RE = re.compile(
+    r'sql;dur=[\d.]+;desc="(\d+) queries", render;dur=([\d.]+), '
+    r'total;dur=[\d.]+'
+)
 
 
 class TestRoutes(BaseTestCase):
@@ -31,3 +51,164 @@ class TestRoutes(BaseTestCase):
                 responce = self.author_client.get(page)
                 self.assertIn('form', responce.context)
                 self.assertIsInstance(responce.context['form'], NoteForm)
+
+    @override_settings(NOTES_COUNT_ON_LIST_PAGE=2)
+    def test_notes_list_keyset_pagination(self):
+        """Тест постраничного вывода списка заметок по id."""
+        Note.objects.bulk_create(
+            Note(title=f'Заметка {index}', text='Текст',
+                 author=self.author, slug=f'note-{index}')
+            for index in range(4)
+        )
+        response = self.author_client.get(LIST_URL)
+        loaded = list(response.context['object_list'])
+        while 'next_after' in response.context:
+            with self.assertNumQueries(3):
+                response = self.author_client.get(
+                    LIST_MORE_URL, {'after': response.context['next_after']}
+                )
+            loaded += response.context['object_list']
+        self.assertEqual(
+            [note.id for note in loaded],
+            list(Note.objects.filter(
+                author=self.author
+            ).order_by('id').values_list('id', flat=True))
+        )
+        self.assertIn('text', loaded[0].get_deferred_fields())
+
+    def test_search_is_ranked_and_scoped(self):
+        """Тест поиска только по своим заметкам с ранжированием."""
+        in_text = Note.objects.create(
+            title='Идея', text='Купить молоко', author=self.author
+        )
+        in_title = Note.objects.create(
+            title='Молоко и хлеб', text='Список', author=self.author
+        )
+        Note.objects.create(
+            title='Молоко', text='Чужая заметка', author=self.not_author
+        )
+        response = self.author_client.get(SEARCH_URL, {'q': 'молоко'})
+        self.assertEqual(response.context['object_list'], [in_title, in_text])
+        response = self.author_client.get(
+            SEARCH_URL, {'q': str(self.author.pk)}
+        )
+        self.assertEqual(response.context['object_list'], [])
+
+    def test_search_index_follows_changes(self):
+        """Тест обновления индекса при изменении и удалении заметок."""
+        self.author_client.post(EDIT_URL, {
+            'title': 'Отпуск', 'text': 'Взять палатку', 'slug': self.note.slug
+        })
+        for query, expected in (('палатку', [self.note]),
+                                (self.note.title, [])):
+            with self.subTest(query=query):
+                response = self.author_client.get(SEARCH_URL, {'q': query})
+                self.assertEqual(
+                    response.context['object_list'], expected
+                )
+        self.note.delete()
+        response = self.author_client.get(SEARCH_URL, {'q': 'палатку'})
+        self.assertEqual(response.context['object_list'], [])
+
+    def test_note_detail_not_modified(self):
+        """Тест ответа 304 на странице заметки до её изменения."""
+        response = self.author_client.get(DETAIL_URL)
+        headers = {
+            'HTTP_IF_NONE_MATCH': response['ETag'],
+            'HTTP_IF_MODIFIED_SINCE': response['Last-Modified'],
+        }
+        # Сессия, пользователь и сама заметка.
+        with self.assertNumQueries(3):
+            response = self.author_client.get(DETAIL_URL, **headers)
+        self.assertEqual(response.status_code, HTTPStatus.NOT_MODIFIED)
+        self.assertFalse(response.templates)
+        response = self.not_author_client.get(DETAIL_URL, **headers)
+        self.assertEqual(response.status_code, HTTPStatus.NOT_FOUND)
+        self.author_client.post(EDIT_URL, {
+            'title': 'Отпуск', 'text': 'Взять палатку', 'slug': self.note.slug
+        })
+        response = self.author_client.get(DETAIL_URL, **headers)
+        self.assertEqual(response.status_code, HTTPStatus.OK)
+
+    def test_timed_templates_warm_up(self):
+        """Тест прогрева шаблонов и замера времени их рендеринга."""
+        backend = TimedDjangoTemplates({
+            'NAME': 'timed',
+            'DIRS': [settings.BASE_DIR / 'templates'],
+            'APP_DIRS': False,
+            'OPTIONS': {
+                'loaders': [('django.template.loaders.cached.Loader', [
+                    'django.template.loaders.filesystem.Loader',
+                ])],
+                'warm_up': True,
+            },
+        })
+        cache = backend.engine.template_loaders[0].get_template_cache
+        for name in ('base.html', 'includes/header.html', 'notes/list.html'):
+            self.assertIn(name, cache)
+        renders = template_stats['includes/errors.html'][0]
+        backend.get_template('includes/errors.html').render({})
+        self.assertEqual(
+            template_stats['includes/errors.html'][0], renders + 1
+        )
+
+    @override_settings(TEMPLATE_STATS_LOG_EVERY=2)
+    def test_template_stats_summary(self):
+        """Тест сводки по шаблонам в журнале вместо строки на рендеринг."""
+        template = TimedDjangoTemplates({
+            'NAME': 'timed',
+            'DIRS': [settings.BASE_DIR / 'templates'],
+            'APP_DIRS': False,
+            'OPTIONS': {},
+        }).get_template('includes/errors.html')
+        with self.assertLogs('yanote.templating', 'INFO') as logs:
+            for _ in range(2):
+                template.render({})
+        self.assertTrue(all(
+            record.levelname == 'INFO' for record in logs.records
+        ))
+        self.assertTrue(any(
+            'Шаблон includes/errors.html: рендерингов' in record.getMessage()
+            for record in logs.records
+        ))
+
+    @override_settings(REQUEST_PROFILING=True, REQUEST_PROFILING_FLUSH_EVERY=2)
+    def test_profiling_middleware(self):
+        """Тест заголовка Server-Timing и перцентилей времени по адресам."""
+        timing_windows.clear()
+        # Middleware подключаются при первом запросе клиента, поэтому
+        # клиенты из setUpTestData могли загрузить их без профилирования.
+        client = Client()
+        client.force_login(self.author)
+        response = client.get(LIST_URL)
+        queries, render_ms = SERVER_TIMING_RE.fullmatch(
+            response['Server-Timing']
+        ).groups()
+        self.assertGreater(int(queries), 0)
+        self.assertGreater(float(render_ms), 0)
+        self.assertFalse(RequestTiming.objects.exists())
+        client.get(LIST_URL)
+        self.assertCountEqual(RequestTiming.objects.filter(
+            url_name='notes:list', samples=2
+        ).values_list('metric', flat=True), METRICS)
+        admin = Client()
+        admin.force_login(get_user_model().objects.create_superuser(
+            'admin', password='password'
+        ))
+        response = admin.get(reverse('admin:notes_requesttiming_changelist'))
+        self.assertContains(response, 'notes:list')
+
+    @override_settings(REQUEST_PROFILING=True)
+    def test_profiling_queries_in_other_threads(self):
+        """Тест учёта запросов из потоков sync_to_async."""
+        def select_one():
+            with connection.cursor() as cursor:
+                cursor.execute('SELECT 1')
+            return HttpResponse()
+
+        in_pool = sync_to_async(select_one, thread_sensitive=False)
+        middleware = ProfilingMiddleware(
+            lambda request: async_to_sync(in_pool)()
+        )
+        response = middleware(RequestFactory().get(LIST_URL))
+        self.assertIn('desc="1 queries"', response['Server-Timing'])
@@ -0,0 +1,26 @@
+from unittest import skipIf
+
+from django.db import connection
+from django.test import RequestFactory
+
+from notes.views import NotesList
+from .base_test import BaseTestCase
+
+
+@skipIf(connection.vendor != 'sqlite', 'План запроса SQLite.')
+class TestIndexes(BaseTestCase):
+
+    def test_author_notes_use_index(self):
+        """Тест выборки заметок пользователя по индексу."""
+        view = NotesList()
+        view.request = RequestFactory().get('/')
+        view.request.user = self.author
+        plan = [
+            line.split(' ', 3)[-1]
+            for line in view.get_queryset().explain().splitlines()
+        ]
+        for detail in plan:
+            with self.subTest(detail=detail):
+                self.assertFalse(
+                    detail.startswith('SCAN') and 'USING' not in detail
+                )
@@ -2,9 +2,12 @@ from http import HTTPStatus
 from pytils.translit import slugify
 
 from notes.forms import WARNING
+from notes import slugs
 from notes.models import Note
+from notes.slugs import make_unique_slug
 from .base_test import BaseTestCase
-from .constants import ADD_URL, SUCCESS_URL, DELETE_URL, EDIT_URL
+from .constants import (ADD_URL, SUCCESS_URL, DELETE_URL, EDIT_URL,
+                        NEW_NOTE_TITLE, NOTE_TEXT, NOTE_TITLE)
 
 
 class TestRoutes(BaseTestCase):
@@ -95,3 +98,52 @@ class TestRoutes(BaseTestCase):
         self.assertEqual(new_note.text, self.form_data['text'])
         self.assertEqual(new_note.slug, slugify(self.form_data['title']))
         self.assertEqual(new_note.author, self.author)
+
+    def test_empty_slug_collision(self):
+        """Тест подбора свободного суффикса для совпадающих slug."""
+        expected_slug = slugify(self.note.title)
+        Note.objects.filter(pk=self.note.pk).update(slug=expected_slug)
+        self.form_data.pop('slug')
+        self.form_data['title'] = self.note.title
+        for suffix in (1, 2):
+            with self.subTest(suffix=suffix):
+                response = self.author_client.post(ADD_URL,
+                                                   data=self.form_data)
+                self.assertRedirects(response, SUCCESS_URL)
+                self.assertTrue(Note.objects.filter(
+                    slug=f'{expected_slug}-{suffix}'
+                ).exists())
+
+    def test_unique_slug_single_query(self):
+        """Тест поиска свободного суффикса одним запросом."""
+        slug = slugify(NOTE_TITLE)
+        Note.objects.bulk_create(
+            Note(title=NOTE_TITLE, text=NOTE_TEXT, author=self.author,
+                 slug=f'{slug}{suffix}')
+            for suffix in ('', '-1', '-2', '-10', '-draft', '-99-draft')
+        )
+        note = Note(title=NOTE_TITLE, text=NOTE_TEXT, author=self.author)
+        with self.assertNumQueries(1):
+            note.slug = make_unique_slug(Note.objects, NOTE_TITLE, 100)
+        self.assertEqual(note.slug, f'{slug}-11')
+
+    def test_long_slug(self):
+        """Тест места под суффикс только у совпадающего длинного slug."""
+        title = ' '.join(['Щука'] * 20)
+        slug = slugify(title)[:100]
+        self.assertEqual(make_unique_slug(Note.objects, title, 100), slug)
+        Note.objects.create(title=title, text=NOTE_TEXT, author=self.author,
+                            slug=slug)
+        self.assertEqual(make_unique_slug(Note.objects, title, 100),
+                         f'{slug[:90]}-1')
+
+    def test_slugify_cache(self):
+        """Тест кеширования транслитерации заголовков."""
+        with self.settings(NOTES_SLUG_CACHE_SIZE=1):
+            for title in (NOTE_TITLE, NOTE_TITLE, NEW_NOTE_TITLE, NOTE_TITLE):
+                self.assertEqual(slugs.slugify(title), slugify(title))
+            stats = slugs.get_slugify_stats()
+        self.assertEqual(stats['hits'], 1)
+        self.assertEqual(stats['misses'], 3)
+        self.assertEqual(stats['size'], stats['max_size'])
+        self.assertEqual(stats['hit_rate'], 0.25)
@@ -11,5 +11,7 @@ urlpatterns = [
     path('note/<slug:slug>/', views.NoteDetail.as_view(), name='detail'),
     path('delete/<slug:slug>/', views.NoteDelete.as_view(), name='delete'),
     path('notes/', views.NotesList.as_view(), name='list'),
+    path('notes/more/', views.NotesListMore.as_view(), name='list_more'),
+    path('search/', views.NoteSearch.as_view(), name='search'),
     path('done/', views.NoteSuccess.as_view(), name='success'),
 ]
@@ -1,9 +1,14 @@
+from django.conf import settings
 from django.contrib.auth.mixins import LoginRequiredMixin
+from django.http import Http404
 from django.urls import reverse_lazy
+from django.utils.decorators import method_decorator
 from django.views import generic
+from django.views.decorators.http import condition
 
 from .forms import NoteForm
 from .models import Note
+from .search import search_note_ids
 
 
 class Home(generic.TemplateView):
@@ -50,10 +55,100 @@ class NoteDelete(NoteBase, generic.DeleteView):
 
 
 class NotesList(NoteBase, generic.ListView):
-    """Список всех заметок пользователя."""
-    template_name = 'notes/list.html'
+    """
+    Список всех заметок пользователя.
 
+    Заметки выводятся страницами по id: следующая страница начинается
+    после id, переданного в параметре after, поэтому стоимость запроса
+    не зависит от номера страницы и общего числа заметок.
+    """
+    template_name = 'notes/list.html'
 
+    def get_queryset(self):
+        queryset = super().get_queryset().only(
+            'id', 'title', 'slug'
+        ).order_by('id')
+        after = self.request.GET.get('after')
+        if after:
+            try:
+                queryset = queryset.filter(id__gt=int(after))
+            except ValueError:
+                raise Http404('Некорректный параметр after.')
+        return queryset[:settings.NOTES_COUNT_ON_LIST_PAGE]
+
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+        notes = list(self.object_list)
+        if len(notes) == settings.NOTES_COUNT_ON_LIST_PAGE:
+            context['next_after'] = notes[-1].id
+        return context
+
+
+class NotesListMore(NotesList):
+    """Следующая страница списка заметок в виде HTML-фрагмента."""
+    template_name = 'notes/includes/note_items.html'
+
+
+def get_note(request, slug):
+    """
+    Заметка пользователя для валидаторов и самой страницы.
+
+    Загружается одним запросом: для ответа 304 он единственный,
+    а при полном ответе заметку берёт NoteDetail.
+    Чужая заметка не найдётся, и страница ответит 404.
+    """
+    if not hasattr(request, 'note'):
+        request.note = Note.objects.filter(
+            slug=slug, author=request.user
+        ).first()
+    return request.note
+
+
+def note_etag(request, slug):
+    note = get_note(request, slug)
+    if note is not None:
+        return f'note-{note.pk}-{note.updated_at.timestamp()}'
+
+
+def note_last_modified(request, slug):
+    note = get_note(request, slug)
+    if note is not None:
+        return note.updated_at
+
+
+@method_decorator(
+    condition(etag_func=note_etag, last_modified_func=note_last_modified),
+    name='get',
+)
 class NoteDetail(NoteBase, generic.DetailView):
     """Заметка подробно."""
     template_name = 'notes/detail.html'
+
+    def get_object(self, queryset=None):
+        """Заметка уже загружена при проверке ETag, см. get_note."""
+        note = getattr(self.request, 'note', None)
+        if note is not None:
+            return note
+        return super().get_object(queryset)
+
+
+class NoteSearch(NoteBase, generic.ListView):
+    """Полнотекстовый поиск по заметкам пользователя."""
+    template_name = 'notes/search.html'
+
+    def get_queryset(self):
+        """Заметки в порядке релевантности, только свои."""
+        ids = search_note_ids(
+            self.request.GET.get('q', ''),
+            self.request.user.pk,
+            settings.NOTES_COUNT_ON_SEARCH_PAGE,
+        )
+        notes = super().get_queryset().only(
+            'id', 'title', 'slug'
+        ).in_bulk(ids)
+        return [notes[pk] for pk in ids if pk in notes]
+
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+        context['query'] = self.request.GET.get('q', '')
+        return context
@@ -1,3 +1,4 @@
+import os
 from pathlib import Path
 
 from django.urls import reverse_lazy
@@ -22,6 +23,7 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    'notes.profiling.ProfilingMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
@@ -87,3 +89,22 @@ DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 
 LOGIN_URL = reverse_lazy('users:login')
 LOGIN_REDIRECT_URL = reverse_lazy('notes:home')
+
+NOTES_COUNT_ON_LIST_PAGE = 100
+
+NOTES_COUNT_ON_SEARCH_PAGE = 50
+
+NOTES_SLUG_CACHE_SIZE = 10000
+
+# Профилирование запросов, см. notes/profiling.py.
+REQUEST_PROFILING = os.environ.get('REQUEST_PROFILING') == '1'
+
+REQUEST_PROFILING_SAMPLE_RATE = 1.0
+
+REQUEST_PROFILING_WINDOW = 1000
+
+REQUEST_PROFILING_FLUSH_EVERY = 20
+
+# Раз в столько рендерингов шаблонов в журнал пишется их сводка,
+# см. yanote/templating.py.
+TEMPLATE_STATS_LOG_EVERY = 1000
@@ -0,0 +1,102 @@
+"""
+Шаблонизатор Django с замером времени рендеринга и прогревом кеша.
+
+Время каждого рендеринга копится в template_stats по имени шаблона
+и пишется в журнал yanote.templating с уровнем DEBUG, а каждые
+TEMPLATE_STATS_LOG_EVERY рендерингов туда же с уровнем INFO выводится
+сводка по всем шаблонам. Вложенные шаблоны
+из include и extends входят во время шаблона, который их подключил,
+а фрагменты из render_to_string замеряются отдельно.
+"""
+import logging
+import threading
+import time
+from collections import defaultdict
+from pathlib import Path
+
+from django.conf import settings
+from django.template.backends.django import DjangoTemplates, Template
+
+logger = logging.getLogger(__name__)
+
+# Имя шаблона: [число рендерингов, суммарное и максимальное время в мс].
+template_stats = defaultdict(lambda: [0, 0.0, 0.0])
+stats_lock = threading.Lock()
+renders_since_log = 0
+
+
+def record_render(name, elapsed_ms):
+    global renders_since_log
+    with stats_lock:
+        stats = template_stats[name]
+        stats[0] += 1
+        stats[1] += elapsed_ms
+        stats[2] = max(stats[2], elapsed_ms)
+        renders_since_log += 1
+        log_summary = renders_since_log >= settings.TEMPLATE_STATS_LOG_EVERY
+        if log_summary:
+            renders_since_log = 0
+    logger.debug('Шаблон %s отрисован за %.2f мс', name, elapsed_ms)
+    if log_summary:
+        log_template_stats()
+
+
+def log_template_stats():
+    """Пишет в журнал сводку по шаблонам, от самых долгих в сумме."""
+    with stats_lock:
+        rows = sorted(
+            ((name, *stats) for name, stats in template_stats.items()),
+            key=lambda row: row[2], reverse=True,
+        )
+    for name, count, total_ms, max_ms in rows:
+        logger.info(
+            'Шаблон %s: рендерингов %d, в среднем %.2f мс, максимум %.2f мс',
+            name, count, total_ms / count, max_ms,
+        )
+
+
+class TimedTemplate(Template):
+
+    def render(self, context=None, request=None):
+        started = time.perf_counter()
+        try:
+            return super().render(context, request)
+        finally:
+            record_render(
+                self.origin.template_name,
+                (time.perf_counter() - started) * 1e3,
+            )
+
+
+class TimedDjangoTemplates(DjangoTemplates):
+    """
+    DjangoTemplates, который замеряет рендеринг шаблонов.
+
+    С опцией warm_up все шаблоны из DIRS компилируются при создании
+    движка; вместе с кешированным загрузчиком это убирает чтение
+    и разбор файлов из первых запросов.
+    """
+
+    def __init__(self, params):
+        params = params.copy()
+        options = params['OPTIONS'] = params.get('OPTIONS', {}).copy()
+        warm_up = options.pop('warm_up', False)
+        super().__init__(params)
+        if warm_up:
+            self.warm_up()
+
+    def get_template(self, template_name):
+        template = super().get_template(template_name)
+        return TimedTemplate(template.template, self)
+
+    def warm_up(self):
+        """Загружает все шаблоны из DIRS; возвращает их число."""
+        count = 0
+        for directory in map(Path, self.dirs):
+            for path in sorted(directory.rglob('*.html')):
+                self.engine.get_template(
+                    path.relative_to(directory).as_posix()
+                )
+                count += 1
+        logger.info('Прогрето шаблонов: %s', count)
+        return count
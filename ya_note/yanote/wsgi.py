@@ -10,7 +10,12 @@ https://docs.djangoproject.com/en/3.2/howto/deployment/wsgi/
 import os
 
 from django.core.wsgi import get_wsgi_application
+from django.template import engines
 
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'yanote.settings')
 
 application = get_wsgi_application()
+
+# Шаблонизаторы создаются при старте, а не на первом запросе:
+# так с опцией warm_up шаблоны компилируются до приёма запросов.
+engines.all()